@@ -0,0 +1,171 @@
+"""Publish case and statistics change events after case writes commit."""
+import asyncio
+import logging
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+from case_feed import current_sequence
+from case_stats import read_stats
+from config import settings
+from event_broker import broker
+from models import Case, CaseUpdate, Tag
+
+logger = logging.getLogger(__name__)
+
+# session.info key holding the changes of the current transaction
+CHANGES_KEY = "case_changes"
+
+# Latest change feed sequence this process has published events for
+_published_sequence = 0
+# Task watching the change feed for commits made by other processes
+_watcher_task: Optional[asyncio.Task] = None
+
+
+def _changes(session: Session) -> Dict[str, Set]:
+    """Pending changes of the session's current transaction."""
+    return session.info.setdefault(CHANGES_KEY, {
+        "created": set(),
+        "updated": set(),
+        "deleted": set(),
+        "bulk": set(),  # control numbers written with Core statements
+    })
+
+
+def note_bulk_case_changes(session: Session, control_nos: Iterable[str]):
+    """
+    Record cases written with Core statements, which the flush hook cannot see.
+
+    Args:
+        session: Session whose commit publishes the change
+        control_nos: Control numbers of the inserted or updated cases
+    """
+    _changes(session)["bulk"].update(control_nos)
+
+
+def _collect_case_changes(session: Session, flush_context):
+    """after_flush hook: remember which cases this flush touched."""
+    changes = None
+
+    for obj in session.new:
+        if isinstance(obj, Case):
+            changes = changes or _changes(session)
+            changes["created"].add(obj.id)
+        elif isinstance(obj, (Tag, CaseUpdate)) and obj.case_id:
+            changes = changes or _changes(session)
+            changes["updated"].add(obj.case_id)
+
+    for obj in session.dirty:
+        if isinstance(obj, Case) and session.is_modified(obj):
+            changes = changes or _changes(session)
+            changes["updated"].add(obj.id)
+
+    for obj in session.deleted:
+        if isinstance(obj, Case):
+            changes = changes or _changes(session)
+            changes["deleted"].add(obj.id)
+        elif isinstance(obj, (Tag, CaseUpdate)) and obj.case_id:
+            changes = changes or _changes(session)
+            changes["updated"].add(obj.case_id)
+
+
+def _discard_case_changes(session: Session, previous_transaction=None):
+    """after_rollback hook: nothing was written."""
+    session.info.pop(CHANGES_KEY, None)
+
+
+def _publish_stats(session_factory: sessionmaker):
+    """Publish stats_changed and note the feed sequence it reflects."""
+    global _published_sequence
+    try:
+        db = session_factory()
+        try:
+            sequence = current_sequence(db)
+            stats = read_stats(db)
+        finally:
+            db.close()
+        _published_sequence = max(_published_sequence, sequence)
+        if stats is not None:
+            broker.publish("stats_changed", stats)
+    except Exception as e:
+        logger.error(f"Failed to publish statistics: {e}")
+
+
+async def _watch_case_feed(session_factory: sessionmaker):
+    """
+    Publish events for case changes committed by other processes.
+
+    Commit hooks only reach subscribers of the process that committed, and
+    background syncs run in the sync leader alone. While this process has
+    subscribers, poll the change feed head and publish cases_changed (which
+    clients answer by reading the feed) and stats_changed when it moves.
+    """
+    global _published_sequence
+
+    def read_head() -> int:
+        db = session_factory()
+        try:
+            return current_sequence(db)
+        finally:
+            db.close()
+
+    try:
+        _published_sequence = max(_published_sequence, await asyncio.to_thread(read_head))
+    except Exception as e:
+        logger.error(f"Failed to read the case change feed: {e}")
+    while broker.subscriber_count:
+        await asyncio.sleep(settings.events_feed_poll_seconds)
+        try:
+            head = await asyncio.to_thread(read_head)
+        except Exception as e:
+            logger.error(f"Failed to read the case change feed: {e}")
+            continue
+        if head <= _published_sequence:
+            continue
+
+        broker.publish("cases_changed", {"created": [], "updated": [], "deleted": [], "bulk_control_nos": []})
+        await asyncio.to_thread(_publish_stats, session_factory)
+
+
+def start_feed_watcher(session_factory: sessionmaker):
+    """
+    Watch the change feed on the running loop unless already watching.
+
+    Call when a subscriber connects; the watcher stops once the last one leaves.
+
+    Args:
+        session_factory: Session factory to read the feed with
+    """
+    global _watcher_task
+    if _watcher_task is None or _watcher_task.done():
+        _watcher_task = asyncio.get_running_loop().create_task(_watch_case_feed(session_factory))
+
+
+def register_case_events(session_factory: sessionmaker):
+    """
+    Publish cases_changed and stats_changed events for sessions from session_factory.
+
+    Args:
+        session_factory: Session factory whose commits are published
+    """
+    def publish_case_changes(session: Session):
+        """after_commit hook: push what the transaction changed to subscribers."""
+        changes = session.info.pop(CHANGES_KEY, None)
+        if not changes or not broker.subscriber_count:
+            return
+
+        created = changes["created"] - changes["deleted"]
+        updated = changes["updated"] - created - changes["deleted"]
+        broker.publish("cases_changed", {
+            "created": sorted(created),
+            "updated": sorted(updated),
+            "deleted": sorted(changes["deleted"]),
+            "bulk_control_nos": sorted(changes["bulk"]),
+        })
+
+        _publish_stats(session_factory)
+
+    event.listen(session_factory, "after_flush", _collect_case_changes)
+    event.listen(session_factory, "after_rollback", _discard_case_changes)
+    event.listen(session_factory, "after_commit", publish_case_changes)
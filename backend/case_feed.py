@@ -0,0 +1,161 @@
+"""Case change feed: a sequence-numbered log of case inserts, updates and deletes."""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import event, func, insert, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from models import Case, CaseChange, CaseUpdate, Tag
+
+logger = logging.getLogger(__name__)
+
+# Control numbers per lookup when logging bulk writes
+BULK_LOOKUP_CHUNK = 500
+
+# PostgreSQL advisory lock key serializing change log writers
+FEED_LOCK_KEY = 0x63617365  # "case"
+
+
+def _log(session: Session, entries: List[Dict[str, Any]]):
+    """
+    Append change log entries in the session's transaction.
+
+    Readers page with `id > since`, which is only safe if sequence numbers
+    become visible in order. PostgreSQL hands out sequence values before
+    commit, so a writer holds a transaction-scoped advisory lock from taking
+    its IDs until it commits; SQLite already serializes writers.
+    """
+    if not entries:
+        return
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": FEED_LOCK_KEY})
+    connection.execute(insert(CaseChange.__table__), entries)
+
+
+def _record_case_changes(session: Session, flush_context):
+    """after_flush hook: log every case the flush created, updated or deleted."""
+    now = datetime.utcnow()
+    entries = {}
+
+    def note(case_id, control_no, action):
+        # One entry per case and flush; a delete wins over other actions
+        if case_id is not None and entries.get(case_id, {}).get("action") != "deleted":
+            entries[case_id] = {"case_id": case_id, "control_no": control_no, "action": action, "changed_at": now}
+
+    for obj in session.new:
+        if isinstance(obj, Case):
+            note(obj.id, obj.control_no, "created")
+    for obj in session.dirty:
+        if isinstance(obj, Case) and session.is_modified(obj):
+            note(obj.id, obj.control_no, "updated")
+    for obj in list(session.new) + list(session.deleted):
+        # Tags and updates are part of the case payload
+        if isinstance(obj, (Tag, CaseUpdate)) and obj.case_id and obj.case_id not in entries:
+            note(obj.case_id, None, "updated")
+    for obj in session.deleted:
+        if isinstance(obj, Case):
+            entries.pop(obj.id, None)
+            note(obj.id, obj.control_no, "deleted")
+
+    _log(session, list(entries.values()))
+
+
+def record_bulk_case_changes(session: Session, created: Iterable[str], updated: Iterable[str]):
+    """
+    Log cases written with Core statements, which the flush hook cannot see.
+
+    Args:
+        session: Session holding the bulk write's transaction
+        created: Control numbers of inserted cases
+        updated: Control numbers of updated cases
+    """
+    actions = {control_no: "updated" for control_no in updated}
+    actions.update({control_no: "created" for control_no in created})
+    control_nos = list(actions)
+    now = datetime.utcnow()
+
+    for start in range(0, len(control_nos), BULK_LOOKUP_CHUNK):
+        chunk = control_nos[start:start + BULK_LOOKUP_CHUNK]
+        rows = session.query(Case.id, Case.control_no).filter(Case.control_no.in_(chunk)).all()
+        _log(session, [
+            {"case_id": case_id, "control_no": control_no, "action": actions[control_no], "changed_at": now}
+            for case_id, control_no in rows
+        ])
+
+
+def current_sequence(db: Session) -> int:
+    """Sequence number of the latest change (0 if none)."""
+    return db.query(func.coalesce(func.max(CaseChange.id), 0)).scalar()
+
+
+def read_case_changes(db: Session, since: int, limit: int) -> Dict[str, Any]:
+    """
+    Read the cases changed after a sequence number.
+
+    Sequence numbers commit in order (see _log), so an entry can never
+    appear behind a next_since that was already handed out.
+
+    Args:
+        db: Database session
+        since: Last sequence number the client has applied
+        limit: Maximum change log entries to read
+
+    Returns:
+        Dictionary with the changed case IDs (latest state wins), tombstones
+        for deleted cases, next_since, has_more, and reset when `since` is
+        older than the retained log
+    """
+    oldest = db.query(func.min(CaseChange.id)).scalar()
+    if oldest is not None and since < oldest - 1:
+        return {"case_ids": [], "deleted": [], "next_since": current_sequence(db), "has_more": False, "reset": True}
+
+    entries = db.query(CaseChange.id, CaseChange.case_id, CaseChange.control_no, CaseChange.action).filter(
+        CaseChange.id > since
+    ).order_by(CaseChange.id).limit(limit + 1).all()
+
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Latest entry per case
+    latest = {}
+    for seq, case_id, control_no, action in entries:
+        latest[case_id] = (seq, control_no, action)
+
+    return {
+        "case_ids": [case_id for case_id, (_, _, action) in latest.items() if action != "deleted"],
+        "deleted": [
+            {"id": case_id, "control_no": control_no, "seq": seq}
+            for case_id, (seq, control_no, action) in latest.items() if action == "deleted"
+        ],
+        "next_since": entries[-1][0] if entries else max(since, 0),
+        "has_more": has_more,
+        "reset": False,
+    }
+
+
+def prune_case_changes(db: Session, retention_days: int) -> int:
+    """
+    Drop change log entries older than the retention window.
+
+    The newest entry is always kept so sequence numbers never restart.
+
+    Args:
+        db: Database session (caller commits)
+        retention_days: Days of changes to keep
+
+    Returns:
+        Number of entries removed
+    """
+    newest = current_sequence(db)
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    return db.query(CaseChange).filter(
+        CaseChange.changed_at < cutoff,
+        CaseChange.id < newest
+    ).delete(synchronize_session=False)
+
+
+def register_change_feed(session_factory: sessionmaker):
+    """Log case changes for every session created by session_factory."""
+    event.listen(session_factory, "after_flush", _record_case_changes)
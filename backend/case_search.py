@@ -0,0 +1,162 @@
+"""Full-text search over cases (SQLite FTS5 / PostgreSQL tsvector)."""
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Column, Float, Integer, MetaData, Table, func, literal_column, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query
+
+from models import Case
+
+logger = logging.getLogger(__name__)
+
+# Columns covered by the search index
+SEARCH_COLUMNS = ("control_no", "description", "reported_by")
+
+# FTS5 virtual table mirroring the searchable case columns. It lives outside
+# Base.metadata so create_all() never tries to create it as a normal table.
+cases_fts = Table(
+    "cases_fts",
+    MetaData(),
+    Column("rowid", Integer),
+    Column("rank", Float),
+)
+
+SQLITE_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5(
+        {', '.join(SEARCH_COLUMNS)},
+        content='cases', content_rowid='id'
+    )
+    """,
+    # Triggers keep the index in sync for every writer (API, Sheets sync,
+    # MyNaga sync, Excel import) without touching their code paths
+    """
+    CREATE TRIGGER IF NOT EXISTS cases_fts_ai AFTER INSERT ON cases BEGIN
+        INSERT INTO cases_fts(rowid, control_no, description, reported_by)
+        VALUES (new.id, new.control_no, new.description, new.reported_by);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cases_fts_ad AFTER DELETE ON cases BEGIN
+        INSERT INTO cases_fts(cases_fts, rowid, control_no, description, reported_by)
+        VALUES ('delete', old.id, old.control_no, old.description, old.reported_by);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cases_fts_au
+    AFTER UPDATE OF control_no, description, reported_by ON cases BEGIN
+        INSERT INTO cases_fts(cases_fts, rowid, control_no, description, reported_by)
+        VALUES ('delete', old.id, old.control_no, old.description, old.reported_by);
+        INSERT INTO cases_fts(rowid, control_no, description, reported_by)
+        VALUES (new.id, new.control_no, new.description, new.reported_by);
+    END
+    """,
+]
+
+# PostgreSQL indexes this exact expression, so queries must use it verbatim.
+# Hyphens become spaces first: the default parser would otherwise read
+# "OTH-251001-0001" as a hyphenated word plus signed integers ("-251001"),
+# which the prefix query "251001:*" never matches. Query tokens are split
+# on non-word characters (see _tokenize), so both sides agree.
+PG_DOCUMENT = "to_tsvector('simple', replace({}, '-', ' '))".format(
+    " || ' ' || ".join(f"coalesce(cases.{col}, '')" for col in SEARCH_COLUMNS)
+)
+
+PG_FTS_DDL = [
+    # Index over the expression used before hyphens were replaced
+    "DROP INDEX IF EXISTS ix_cases_search",
+    f"CREATE INDEX IF NOT EXISTS ix_cases_search_words ON cases USING GIN ({PG_DOCUMENT})",
+]
+
+# Backend chosen by init_search_index(): "sqlite", "postgresql" or None (ILIKE)
+_search_backend: Optional[str] = None
+
+
+def init_search_index(engine: Engine):
+    """
+    Create the full-text index for the current database and backfill it.
+
+    Falls back to ILIKE matching if the database has no full-text support.
+
+    Args:
+        engine: SQLAlchemy engine the cases table lives in
+    """
+    global _search_backend
+
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cases_fts'"
+                )).first()
+                for statement in SQLITE_FTS_DDL:
+                    conn.execute(text(statement))
+                if not exists:
+                    # Index rows written before the FTS table existed
+                    conn.execute(text("INSERT INTO cases_fts(cases_fts) VALUES ('rebuild')"))
+            elif dialect == "postgresql":
+                for statement in PG_FTS_DDL:
+                    conn.execute(text(statement))
+            else:
+                logger.info(f"No full-text search support for {dialect}, using ILIKE")
+                _search_backend = None
+                return
+
+        _search_backend = dialect
+        logger.info(f"Full-text case search enabled ({dialect})")
+
+    except Exception as e:
+        logger.warning(f"Full-text search unavailable, falling back to ILIKE: {e}")
+        _search_backend = None
+
+
+def _tokenize(term: str) -> List[str]:
+    """Split a search term into word tokens."""
+    return re.findall(r"\w+", term)
+
+
+def apply_search(query: Query, term: str) -> Tuple[Query, Optional[list]]:
+    """
+    Restrict a Case query to rows matching a search term.
+
+    Every word of the term must match (as a prefix, so partial input from the
+    search box still matches) in the control number, description or reporter.
+
+    Args:
+        query: Query over Case
+        term: Raw search input
+
+    Returns:
+        Tuple of (filtered query, ORDER BY clauses ranking by relevance or
+        None if the backend cannot rank)
+    """
+    tokens = _tokenize(term)
+    if not tokens:
+        return query, None
+
+    if _search_backend == "sqlite":
+        match = " ".join(f'"{token}"*' for token in tokens)
+        matches = (
+            select(cases_fts.c.rowid.label("case_id"), cases_fts.c.rank.label("rank"))
+            .where(literal_column("cases_fts").op("MATCH")(match))
+            .subquery()
+        )
+        query = query.join(matches, matches.c.case_id == Case.id)
+        # FTS5 rank is bm25(): lower is more relevant
+        return query, [matches.c.rank.asc()]
+
+    if _search_backend == "postgresql":
+        document = literal_column(PG_DOCUMENT)
+        ts_query = func.to_tsquery("simple", " & ".join(f"{token}:*" for token in tokens))
+        query = query.filter(document.op("@@")(ts_query))
+        return query, [func.ts_rank(document, ts_query).desc()]
+
+    query = query.filter(
+        (Case.control_no.ilike(f"%{term}%")) |
+        (Case.description.ilike(f"%{term}%")) |
+        (Case.reported_by.ilike(f"%{term}%"))
+    )
+    return query, None
@@ -0,0 +1,195 @@
+"""Dashboard statistics backed by an incrementally maintained counters row."""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, event, func, inspect, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from models import Case, CaseCounters, Cluster, Office
+
+logger = logging.getLogger(__name__)
+
+# The single case_counters row
+COUNTERS_ID = 1
+
+# Case.status value -> counter column
+STATUS_COUNTERS = {
+    "OPEN": "open_cases",
+    "RESOLVED": "resolved_cases",
+    "FOR REROUTING": "rerouting_cases",
+}
+
+
+def rebuild_case_counters(db: Session) -> Dict[str, int]:
+    """
+    Recompute all case counters in one aggregate pass and store them.
+
+    Used at startup, when the counters row is missing, and after bulk writes
+    whose effect cannot be computed exactly (see adjust_case_counters).
+
+    Args:
+        db: Database session (caller commits)
+
+    Returns:
+        The stored counter values
+    """
+    row = db.query(
+        func.count(Case.id),
+        *[
+            func.coalesce(func.sum(case((Case.status == status, 1), else_=0)), 0)
+            for status in STATUS_COUNTERS
+        ],
+        func.coalesce(func.sum(Case.case_aging), 0),
+        func.count(Case.case_aging),
+    ).one()
+
+    values = dict(zip(
+        ["total_cases", *STATUS_COUNTERS.values(), "aging_sum", "aging_count"],
+        [int(value) for value in row]
+    ))
+
+    counters = db.get(CaseCounters, COUNTERS_ID)
+    if counters is None:
+        counters = CaseCounters(id=COUNTERS_ID)
+        db.add(counters)
+    for key, value in values.items():
+        setattr(counters, key, value)
+    db.flush()
+
+    return values
+
+
+def read_stats(db: Session) -> Optional[dict]:
+    """
+    Read dashboard statistics with a single-row query.
+
+    Returns:
+        Statistics dictionary, or None if the counters row does not exist
+    """
+    average_aging = func.coalesce(
+        CaseCounters.aging_sum * 1.0 / func.nullif(CaseCounters.aging_count, 0), 0
+    )
+    active_offices = select(func.count(Office.id)).where(Office.is_active == True).scalar_subquery()
+    total_clusters = select(func.count(Cluster.id)).scalar_subquery()
+
+    row = db.query(
+        CaseCounters.total_cases,
+        CaseCounters.open_cases,
+        CaseCounters.resolved_cases,
+        CaseCounters.rerouting_cases,
+        active_offices,
+        total_clusters,
+        average_aging,
+    ).filter(CaseCounters.id == COUNTERS_ID).first()
+
+    if row is None:
+        return None
+
+    return {
+        "total_cases": row[0],
+        "open_cases": row[1],
+        "resolved_cases": row[2],
+        "rerouting_cases": row[3],
+        "total_offices": row[4],
+        "total_clusters": row[5],
+        "average_case_aging": float(row[6]),
+    }
+
+
+def _count(delta: Dict[str, int], status: Optional[str], aging: Optional[int], sign: int):
+    """Add (sign=1) or remove (sign=-1) one case's contribution to delta."""
+    column = STATUS_COUNTERS.get(status)
+    if column:
+        delta[column] += sign
+    if aging is not None:
+        delta["aging_sum"] += sign * aging
+        delta["aging_count"] += sign
+
+
+def _previous_value(state, key: str):
+    """
+    Value of an attribute as last loaded from the database.
+
+    Case.status and Case.case_aging use active_history, so a change to an
+    expired instance still records the old value.
+    """
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(state.obj(), key)
+
+
+def _apply_counter_deltas(session: Session, flush_context):
+    """after_flush hook: fold inserted, updated and deleted cases into the counters row."""
+    delta: Dict[str, int] = defaultdict(int)
+
+    for obj in session.new:
+        if isinstance(obj, Case):
+            delta["total_cases"] += 1
+            _count(delta, obj.status, obj.case_aging, 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Case):
+            state = inspect(obj)
+            delta["total_cases"] -= 1
+            _count(delta, _previous_value(state, "status"), _previous_value(state, "case_aging"), -1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Case) or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        if not (state.attrs.status.history.has_changes() or state.attrs.case_aging.history.has_changes()):
+            continue
+        _count(delta, _previous_value(state, "status"), _previous_value(state, "case_aging"), -1)
+        _count(delta, obj.status, obj.case_aging, 1)
+
+    _store_delta(session, delta)
+
+
+def _store_delta(session: Session, delta: Dict[str, int]):
+    """Add counter deltas to the counters row in the session's transaction."""
+    changes = {key: value for key, value in delta.items() if value}
+    if not changes:
+        return
+
+    table = CaseCounters.__table__
+    session.connection().execute(
+        update(table)
+        .where(table.c.id == COUNTERS_ID)
+        .values({key: table.c[key] + value for key, value in changes.items()})
+    )
+
+
+def adjust_case_counters(
+    db: Session,
+    removed: Iterable[Tuple[Optional[str], Optional[int]]],
+    added: Iterable[Tuple[Optional[str], Optional[int]]],
+):
+    """
+    Fold cases written with Core statements into the counters row.
+
+    Bulk writes bypass the flush hook; this applies the same deltas without
+    an aggregate pass. An inserted case is only added, an updated one is
+    removed with its old values and added with its new ones.
+
+    Args:
+        db: Database session holding the bulk write's transaction
+        removed: (status, case_aging) of case rows as they were before the write
+        added: (status, case_aging) of case rows as they are after the write
+    """
+    delta: Dict[str, int] = defaultdict(int)
+    for status, aging in removed:
+        delta["total_cases"] -= 1
+        _count(delta, status, aging, -1)
+    for status, aging in added:
+        delta["total_cases"] += 1
+        _count(delta, status, aging, 1)
+    _store_delta(db, delta)
+
+
+def register_counter_events(session_factory: sessionmaker):
+    """Keep case_counters current for every session created by session_factory."""
+    event.listen(session_factory, "after_flush", _apply_counter_deltas)
@@ -0,0 +1,200 @@
+"""Bulk insert/update of cases keyed by control number."""
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, insert
+from sqlalchemy.orm import Session
+
+from models import Case
+from case_stats import adjust_case_counters, rebuild_case_counters
+from case_events import note_bulk_case_changes
+from case_feed import record_bulk_case_changes
+from sheets_outbox import pending_write_control_nos
+
+logger = logging.getLogger(__name__)
+
+# Control numbers per existing-case lookup
+KEY_LOOKUP_CHUNK = 500
+
+# Sync source -> Case column holding that source's last fingerprint.
+# Sources that share a case must not compare against each other's hash.
+SOURCE_HASH_COLUMNS = {
+    "sheet": "sheet_hash",
+    "mynaga": "mynaga_hash",
+}
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """
+    Fingerprint a mapped case record.
+
+    Args:
+        record: Case field dictionary
+
+    Returns:
+        Hex SHA-256 digest of the record's fields
+    """
+    payload = json.dumps(record, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_case_keys(
+    db: Session,
+    hash_column: str,
+    control_nos: List[str]
+) -> Dict[str, Tuple[int, Optional[str], Optional[str], Optional[int]]]:
+    """
+    Load the columns an upsert compares for the given control numbers.
+
+    Args:
+        db: Database session
+        hash_column: Fingerprint column of the source being synced
+        control_nos: Control numbers of the batch being written
+
+    Returns:
+        Dictionary of control_no -> (case id, source hash, status, case aging)
+        for the control numbers that exist
+    """
+    keys = {}
+    for start in range(0, len(control_nos), KEY_LOOKUP_CHUNK):
+        chunk = control_nos[start:start + KEY_LOOKUP_CHUNK]
+        for case_id, control_no, fingerprint, status, aging in db.query(
+            Case.id, Case.control_no, getattr(Case, hash_column), Case.status, Case.case_aging
+        ).filter(Case.control_no.in_(chunk)):
+            keys[control_no] = (case_id, fingerprint, status, aging)
+    return keys
+
+
+def _insert_statement(db: Session, table):
+    """INSERT that skips rows whose control_no already exists (dialect-native where possible)."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return insert(table)
+    return dialect_insert(table).on_conflict_do_nothing(index_elements=["control_no"])
+
+
+def _counted_values(
+    record: Dict[str, Any],
+    stored: Optional[Tuple[Optional[str], Optional[int]]] = None
+) -> Tuple[Optional[str], Optional[int]]:
+    """
+    (status, case_aging) a case has after being written from record.
+
+    Args:
+        record: Case field dictionary
+        stored: (status, case_aging) before an update; None for an insert
+
+    Returns:
+        The values the counters should see
+    """
+    if stored is None:
+        # Inserted: missing keys take the column default
+        status = record["status"] if "status" in record else Case.__table__.c.status.default.arg
+        return status, record.get("case_aging")
+
+    # Updated: None leaves the stored value (see the coalesce in bulk_upsert_cases)
+    status = record.get("status")
+    aging = record.get("case_aging")
+    return (
+        status if status is not None else stored[0],
+        aging if aging is not None else stored[1],
+    )
+
+
+def bulk_upsert_cases(db: Session, records: List[Dict[str, Any]], source: str) -> Dict[str, int]:
+    """
+    Insert new cases and update existing ones with a few executemany statements.
+
+    Records are keyed by control_no (the last record wins for duplicates).
+    Records whose fingerprint matches the one this source stored last time
+    are not written at all, nor are sheet rows of cases whose edits are
+    still queued for write-back (both count as unchanged). On update, None values leave the stored column
+    untouched. The caller commits.
+
+    Args:
+        db: Database session
+        records: Case field dictionaries (e.g. CaseCreate.dict()), all with the same keys
+        source: Sync source the records come from (a SOURCE_HASH_COLUMNS key)
+
+    Returns:
+        Dictionary with created, updated and unchanged counts
+    """
+    if source not in SOURCE_HASH_COLUMNS:
+        raise ValueError(f"Unknown sync source: {source}")
+    hash_column = SOURCE_HASH_COLUMNS[source]
+    stats = {"created": 0, "updated": 0, "unchanged": 0}
+
+    by_control_no = {record["control_no"]: record for record in records}
+    if not by_control_no:
+        return stats
+
+    existing = load_case_keys(db, hash_column, list(by_control_no))
+    # The sheet still shows the old values until queued edits are written back
+    held_back = pending_write_control_nos(db) if source == "sheet" else set()
+    inserts = []
+    updates = []
+    for control_no, record in by_control_no.items():
+        record = {**record, hash_column: content_hash(record)}
+        case_id, stored_hash, _, _ = existing.get(control_no, (None, None, None, None))
+        if case_id is None:
+            inserts.append(record)
+        elif stored_hash == record[hash_column] or control_no in held_back:
+            stats["unchanged"] += 1
+        else:
+            updates.append((case_id, record))
+
+    table = Case.__table__
+    now = datetime.utcnow()
+
+    # Rows another writer inserted since load_case_keys() are skipped by the
+    # conflict clause, so count what was actually inserted
+    inserts_exact = True
+    if inserts:
+        inserted = db.execute(_insert_statement(db, table), inserts).rowcount
+        if inserted is None or inserted < 0:
+            inserted = len(inserts)  # Driver cannot tell; assume no conflicts
+        inserts_exact = inserted == len(inserts)
+        stats["created"] = inserted
+
+    if updates:
+        fields = [key for key in updates[0][1] if key != "control_no"]
+        statement = (
+            table.update()
+            .where(table.c.id == bindparam("b_id"))
+            .values({
+                **{field: func.coalesce(bindparam(f"b_{field}"), table.c[field]) for field in fields},
+                "updated_at": bindparam("b_updated_at"),
+            })
+        )
+        db.execute(statement, [
+            {"b_id": case_id, "b_updated_at": now, **{f"b_{field}": record[field] for field in fields}}
+            for case_id, record in updates
+        ])
+        stats["updated"] = len(updates)
+
+    # Core statements bypass the ORM flush hooks that maintain case_counters,
+    # the change feed and change events
+    if inserts or updates:
+        created = [record["control_no"] for record in inserts]
+        updated = [record["control_no"] for _, record in updates]
+        if inserts_exact:
+            removed = [existing[record["control_no"]][2:] for _, record in updates]
+            added = [_counted_values(record) for record in inserts] + [
+                _counted_values(record, existing[record["control_no"]][2:]) for _, record in updates
+            ]
+            adjust_case_counters(db, removed, added)
+        else:
+            # Some inserts conflicted and we cannot tell which: recount
+            logger.warning(f"{len(inserts) - stats['created']} case inserts conflicted; recounting")
+            rebuild_case_counters(db)
+        record_bulk_case_changes(db, created, updated)
+        note_bulk_case_changes(db, created + updated)
+
+    return stats
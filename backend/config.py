@@ -13,6 +13,52 @@ class Settings(BaseSettings):
     api_title: str = "MyNaga Dashboard API"
     api_version: str = "1.0.0"
     
+    # Google Sheets write-back: edits wait this long so bursts coalesce,
+    # then go out in batchUpdate calls of up to this many rows
+    sheets_writeback_flush_seconds: float = 2.0
+    sheets_writeback_batch_size: int = 100
+    
+    # Worker threads for blocking Google Sheets API calls made from async code
+    sheets_io_workers: int = 4
+    
+    # Shared aiohttp connection pools used by the syncs (per event loop)
+    http_pool_size: int = 20
+    http_keepalive_seconds: float = 30.0
+    
+    # Background syncs run only in the process holding the sync lease; a
+    # leader that stops renewing it is replaced after this many seconds
+    sync_lease_seconds: int = 30
+    
+    # Adaptive auto-sync: the interval halves after syncs that found changes
+    # and doubles after idle ones, staying within these bounds
+    sheets_sync_min_seconds: int = 5
+    sheets_sync_max_seconds: int = 300
+    mynaga_sync_min_seconds: int = 60
+    mynaga_sync_max_seconds: int = 1800
+    
+    # MyNaga report fetches are split into windows of this many days,
+    # fetched this many at a time
+    mynaga_fetch_window_days: int = 1
+    mynaga_fetch_concurrency: int = 4
+    
+    # Incremental MyNaga syncs re-fetch reports created this many days before
+    # the newest one seen (to pick up status changes); a full pass over the
+    # month runs every mynaga_full_sync_hours
+    mynaga_recheck_days: int = 3
+    mynaga_full_sync_hours: int = 24
+    
+    # Report-link lookups cache each day's control number -> _id map
+    mynaga_link_cache_ttl_seconds: int = 600
+    mynaga_link_cache_max_days: int = 90
+    
+    # Case change feed entries older than this are pruned at startup;
+    # clients further behind are told to reload
+    case_change_retention_days: int = 7
+    
+    # Workers with event subscribers check the change feed this often for
+    # changes committed by other processes (e.g. the sync leader)
+    events_feed_poll_seconds: float = 2.0
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,8 +1,11 @@
 """Database connection and session management."""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from config import settings
 from models import Base
+from case_stats import register_counter_events, rebuild_case_counters
+from case_events import register_case_events
+from case_feed import prune_case_changes, register_change_feed
 
 # Create database engine
 engine = create_engine(
@@ -14,6 +17,15 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Keep the case_counters row in step with every case write
+register_counter_events(SessionLocal)
+
+# Log every case write for the /api/cases/changes feed
+register_change_feed(SessionLocal)
+
+# Push case and statistics changes to live clients once they commit
+register_case_events(SessionLocal)
+
 
 def get_db() -> Session:
     """Get database session for dependency injection."""
@@ -24,6 +36,34 @@ def get_db() -> Session:
         db.close()
 
 
+def _add_missing_columns():
+    """Add model columns missing from existing tables (create_all only creates new tables)."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
 def init_db():
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    
+    # Full-text search index over cases
+    from case_search import init_search_index
+    init_search_index(engine)
+    
+    # Recount once at startup so the incremental counters never drift
+    db = SessionLocal()
+    try:
+        rebuild_case_counters(db)
+        prune_case_changes(db, settings.case_change_retention_days)
+        db.commit()
+    finally:
+        db.close()
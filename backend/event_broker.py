@@ -0,0 +1,83 @@
+"""In-process publish/subscribe broker for pushing live events to clients."""
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Events a slow subscriber may have pending before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class EventBroker:
+    """
+    Fan out events to subscribers, each reading from its own asyncio queue.
+
+    publish() may be called from any thread (request threads, the scheduler,
+    the sync runtime); events are handed to each subscriber's event loop.
+    """
+
+    def __init__(self):
+        """Initialize an empty broker."""
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Register a subscriber on the running event loop.
+
+        Returns:
+            Queue receiving event dictionaries; pass it to unsubscribe() when done
+        """
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove a subscriber's queue."""
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s[1] is not queue]
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers."""
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: Dict[str, Any]):
+        """
+        Send an event to every subscriber.
+
+        Args:
+            event_type: Event name (e.g. "cases_changed", "stats_changed")
+            data: JSON-serializable event payload
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+
+        event = {"type": event_type, "data": data, "sent_at": datetime.utcnow().isoformat()}
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_deliver, queue, event)
+            except RuntimeError:
+                # Subscriber's loop is closed
+                self.unsubscribe(queue)
+
+
+def _deliver(queue: asyncio.Queue, event: Dict[str, Any]):
+    """Queue an event on the subscriber's loop; a full queue is replaced by a resync."""
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # The client fell behind: drop its backlog and have it reload instead
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({"type": "resync", "data": {}, "sent_at": event["sent_at"]})
+
+
+# Global event broker
+broker = EventBroker()
@@ -0,0 +1,45 @@
+"""Live event push API routes."""
+import asyncio
+import logging
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from case_events import start_feed_watcher
+from database import SessionLocal
+from event_broker import broker
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/events", tags=["Events"])
+
+# Idle connections get a ping this often so proxies keep them open
+PING_INTERVAL_SECONDS = 25
+
+
+@router.websocket("/ws")
+async def events_websocket(websocket: WebSocket):
+    """
+    Push live events to the dashboard.
+    
+    Sends JSON messages {"type", "data", "sent_at"} where type is one of:
+    cases_changed (created/updated/deleted case IDs and control numbers
+    written by bulk syncs), stats_changed (the /api/stats payload), resync
+    (the client fell behind and should reload) and ping.
+    """
+    await websocket.accept()
+    queue = broker.subscribe()
+    # Other workers' commits (background syncs) reach us through the feed
+    start_feed_watcher(SessionLocal)
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=PING_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                event = {"type": "ping", "data": {}}
+            await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.debug(f"Event stream closed: {e}")
+    finally:
+        broker.unsubscribe(queue)
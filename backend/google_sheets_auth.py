@@ -2,12 +2,41 @@
 Google Sheets Authentication Handler for Private Sheets
 Supports both public CSV URLs and private sheets via Service Account
 """
+import asyncio
+import functools
+import hashlib
 import json
 import os
-from typing import Optional, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Dict, Any, Tuple
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from config import settings
+
+# How long spreadsheet metadata (tab titles, gids) is reused before refetching
+METADATA_TTL_SECONDS = 300
+
+# spreadsheet_id -> (fetched_at, metadata), shared by all authenticators
+_metadata_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_metadata_lock = threading.Lock()
+
+
+def invalidate_sheet_metadata(spreadsheet_id: Optional[str] = None):
+    """
+    Drop cached spreadsheet metadata (e.g. after a tab was renamed)
+    
+    Args:
+        spreadsheet_id: Only drop this spreadsheet's metadata; all if None
+    """
+    with _metadata_lock:
+        if spreadsheet_id is None:
+            _metadata_cache.clear()
+        else:
+            _metadata_cache.pop(spreadsheet_id, None)
+
 
 class GoogleSheetsAuthenticator:
     """
@@ -53,16 +82,25 @@ class GoogleSheetsAuthenticator:
         """
         try:
             credentials_info = json.loads(credentials_json)
-            self.credentials = service_account.Credentials.from_service_account_info(
+            self.set_credentials(service_account.Credentials.from_service_account_info(
                 credentials_info,
                 scopes=self.SCOPES
-            )
-            self.service = build('sheets', 'v4', credentials=self.credentials)
+            ))
             return True
         except Exception as e:
             print(f"Error setting credentials from JSON: {str(e)}")
             return False
     
+    def set_credentials(self, credentials):
+        """
+        Use already-parsed credentials and build the Sheets service for them
+        
+        Args:
+            credentials: google.oauth2 service account credentials
+        """
+        self.credentials = credentials
+        self.service = build('sheets', 'v4', credentials=self.credentials, cache_discovery=False)
+    
     def read_sheet(self, spreadsheet_id: str, range_name: str = None, gid: int = None) -> Optional[Dict[str, Any]]:
         """
         Read data from a private Google Sheet
@@ -129,11 +167,16 @@ class GoogleSheetsAuthenticator:
             elif error.resp.status == 404:
                 raise FileNotFoundError("Spreadsheet not found. Check the spreadsheet ID.")
             elif error.resp.status == 400:
-                # Try to get the actual sheet name and retry
+                # The cached tab title may be stale - refetch metadata and retry
+                invalidate_sheet_metadata(spreadsheet_id)
                 try:
                     metadata = self.get_sheet_metadata(spreadsheet_id)
                     if metadata and metadata.get('sheets'):
-                        actual_sheet_name = metadata['sheets'][0]['title']
+                        actual_sheet_name = None
+                        if gid is not None:
+                            actual_sheet_name = self.get_sheet_name_by_gid(spreadsheet_id, gid)
+                        if not actual_sheet_name:
+                            actual_sheet_name = metadata['sheets'][0]['properties']['title']
                         result = self.service.spreadsheets().values().get(
                             spreadsheetId=spreadsheet_id,
                             range=actual_sheet_name
@@ -148,6 +191,36 @@ class GoogleSheetsAuthenticator:
                 raise ValueError(f"Unable to parse range. Make sure the sheet exists. Error: {error}")
             raise
     
+    def batch_read_sheet(self, spreadsheet_id: str, ranges: list) -> list:
+        """
+        Read several ranges from a Google Sheet in one request
+        
+        Args:
+            spreadsheet_id: The ID of the spreadsheet
+            ranges: List of A1 notation ranges
+        
+        Returns:
+            List with the values of each range, in request order
+        """
+        if not self.service:
+            raise ValueError("Google Sheets service not initialized. Please provide credentials.")
+        
+        try:
+            result = self.service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=ranges
+            ).execute()
+            return [value_range.get('values', []) for value_range in result.get('valueRanges', [])]
+        except HttpError as error:
+            print(f"Error reading sheet ranges: {error}")
+            if error.resp.status == 400:
+                invalidate_sheet_metadata(spreadsheet_id)
+            if error.resp.status == 403:
+                raise PermissionError(
+                    "Access denied. Make sure the service account email has access to the sheet."
+                )
+            raise
+    
     def write_to_sheet(self, spreadsheet_id: str, range_name: str, values: list) -> bool:
         """
         Write data back to a Google Sheet
@@ -180,6 +253,51 @@ class GoogleSheetsAuthenticator:
             
         except HttpError as error:
             print(f"Error writing to sheet: {error}")
+            if error.resp.status == 400:
+                # Likely a renamed tab - resolve titles again next time
+                invalidate_sheet_metadata(spreadsheet_id)
+            if error.resp.status == 403:
+                raise PermissionError(
+                    "Access denied. Make sure the service account has EDITOR access to the sheet."
+                )
+            return False
+    
+    def batch_write_to_sheet(self, spreadsheet_id: str, data: list) -> bool:
+        """
+        Write several ranges back to a Google Sheet in one request
+        
+        Args:
+            spreadsheet_id: The ID of the spreadsheet
+            data: List of (range_name, values) tuples, as for write_to_sheet
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.service:
+            raise ValueError("Google Sheets service not initialized. Please provide credentials.")
+        
+        try:
+            body = {
+                'valueInputOption': 'USER_ENTERED',  # Parses input as if entered in UI
+                'data': [
+                    {'range': range_name, 'values': values}
+                    for range_name, values in data
+                ]
+            }
+            result = self.service.spreadsheets().values().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body=body
+            ).execute()
+            
+            updated_cells = result.get('totalUpdatedCells', 0)
+            print(f"Successfully updated {updated_cells} cells in {len(data)} ranges")
+            return True
+            
+        except HttpError as error:
+            print(f"Error writing to sheet: {error}")
+            if error.resp.status == 400:
+                # Likely a renamed tab - resolve titles again next time
+                invalidate_sheet_metadata(spreadsheet_id)
             if error.resp.status == 403:
                 raise PermissionError(
                     "Access denied. Make sure the service account has EDITOR access to the sheet."
@@ -294,6 +412,8 @@ class GoogleSheetsAuthenticator:
         """
         Get metadata about the spreadsheet (title, sheets, etc.)
         
+        Results are cached per spreadsheet for METADATA_TTL_SECONDS.
+        
         Args:
             spreadsheet_id: The ID of the spreadsheet
         
@@ -303,12 +423,17 @@ class GoogleSheetsAuthenticator:
         if not self.service:
             raise ValueError("Google Sheets service not initialized")
         
+        with _metadata_lock:
+            cached = _metadata_cache.get(spreadsheet_id)
+        if cached and time.monotonic() - cached[0] < METADATA_TTL_SECONDS:
+            return cached[1]
+        
         try:
             result = self.service.spreadsheets().get(
                 spreadsheetId=spreadsheet_id
             ).execute()
             
-            return {
+            metadata = {
                 'title': result.get('properties', {}).get('title', ''),
                 'sheets': [
                     {
@@ -321,11 +446,112 @@ class GoogleSheetsAuthenticator:
                     for sheet in result.get('sheets', [])
                 ]
             }
+            
+            with _metadata_lock:
+                _metadata_cache[spreadsheet_id] = (time.monotonic(), metadata)
+            return metadata
         except HttpError as error:
             print(f"Error getting metadata: {error}")
             return None
 
 
+# Process-wide client cache. Credentials are parsed once per credentials JSON
+# and refresh their access token on their own when it expires. Built services
+# wrap a non-thread-safe httplib2 connection, so each thread gets its own.
+_credentials_cache: Dict[str, Any] = {}
+_client_cache: Dict[Tuple[str, int], GoogleSheetsAuthenticator] = {}
+_cache_lock = threading.Lock()
+
+
+def _credentials_key(credentials_json: str) -> str:
+    """Cache key for a credentials JSON string"""
+    return hashlib.sha256(credentials_json.encode('utf-8')).hexdigest()
+
+
+def get_sheets_client(credentials_json: str) -> Optional[GoogleSheetsAuthenticator]:
+    """
+    Get a cached authenticator for service account credentials
+    
+    Args:
+        credentials_json: Service account credentials as JSON string
+    
+    Returns:
+        Authenticated GoogleSheetsAuthenticator, or None if the credentials are invalid
+    """
+    key = _credentials_key(credentials_json)
+    client_key = (key, threading.get_ident())
+    
+    with _cache_lock:
+        client = _client_cache.get(client_key)
+        credentials = _credentials_cache.get(key)
+    if client:
+        return client
+    
+    client = GoogleSheetsAuthenticator()
+    if credentials is not None:
+        client.set_credentials(credentials)
+    elif not client.set_credentials_from_json(credentials_json):
+        return None
+    
+    with _cache_lock:
+        _credentials_cache[key] = client.credentials
+        _client_cache[client_key] = client
+    return client
+
+
+def invalidate_sheets_clients(credentials_json: Optional[str] = None):
+    """
+    Drop cached clients (e.g. when credentials change or a token refresh fails)
+    
+    Args:
+        credentials_json: Only drop clients for these credentials; all if None
+    """
+    with _cache_lock:
+        if credentials_json is None:
+            _credentials_cache.clear()
+            _client_cache.clear()
+            return
+        
+        key = _credentials_key(credentials_json)
+        _credentials_cache.pop(key, None)
+        for client_key in [k for k in _client_cache if k[0] == key]:
+            del _client_cache[client_key]
+
+
+# Bounded pool for Sheets API calls. googleapiclient is blocking, so async
+# callers hand their calls to these threads instead of stalling the event
+# loop; each worker thread keeps its own cached client.
+_io_executor: Optional[ThreadPoolExecutor] = None
+_io_executor_lock = threading.Lock()
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """Create the Sheets I/O pool on first use"""
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(
+                max_workers=settings.sheets_io_workers,
+                thread_name_prefix="sheets-io"
+            )
+        return _io_executor
+
+
+async def run_sheets_io(func: Callable, *args, **kwargs):
+    """
+    Run a blocking Google Sheets call on the Sheets I/O pool
+    
+    Args:
+        func: Blocking callable (e.g. a function using get_sheets_client)
+        *args, **kwargs: Arguments for func
+    
+    Returns:
+        Whatever func returns; exceptions are re-raised in the caller
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_io_executor(), functools.partial(func, *args, **kwargs))
+
+
 # Service account setup instructions
 SETUP_INSTRUCTIONS = """
 === HOW TO SET UP GOOGLE SHEETS SERVICE ACCOUNT (FOR PRIVATE SHEETS) ===
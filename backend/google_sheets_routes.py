@@ -1,4 +1,5 @@
 """Google Sheets sync API routes."""
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from database import get_db
@@ -73,6 +74,10 @@ async def sync_google_sheets(request: SyncRequest, db: Session = Depends(get_db)
     Returns:
         Sync statistics
     """
+    from sync_history import JOB_GOOGLE_SHEETS, finish_sync_run, start_sync_run
+    
+    # Run history is blocking DB I/O; keep it off the event loop
+    run_id = await asyncio.to_thread(start_sync_run, JOB_GOOGLE_SHEETS, "manual")
     try:
         from google_sheets_sync import GoogleSheetsSync
         
@@ -82,14 +87,19 @@ async def sync_google_sheets(request: SyncRequest, db: Session = Depends(get_db)
             credentials_json=request.credentials_json
         )
         stats = await syncer.sync_to_database()
+        await asyncio.to_thread(finish_sync_run, run_id, stats)
         
         return {
             "success": True,
-            "message": f"Synced {stats['created']} new cases, updated {stats['updated']} existing cases",
+            "message": (
+                f"Synced {stats['created']} new cases, updated {stats['updated']} existing cases, "
+                f"{stats['unchanged']} unchanged"
+            ),
             "stats": stats
         }
     
     except Exception as e:
+        await asyncio.to_thread(finish_sync_run, run_id, error=str(e))
         raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
 
 
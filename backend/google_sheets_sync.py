@@ -1,19 +1,47 @@
 """Google Sheets synchronization for real-time data import."""
 import asyncio
-import aiohttp
+import hashlib
+import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from sqlalchemy.orm import Session
-from models import Case
 from schemas import CaseCreate
+from case_upsert import bulk_upsert_cases
+from sync_runtime import get_http_session
 
 logger = logging.getLogger(__name__)
 
+# HTTP validators and body digest of the last synced CSV export, keyed by URL
+_csv_validators: Dict[str, Dict[str, Optional[str]]] = {}
+
+# Sheet layout captured by API syncs, keyed by (spreadsheet_id, gid):
+# header row, control number column index and control_no -> sheet row number
+_sheet_layouts: Dict[Tuple[str, Optional[int]], Dict[str, Any]] = {}
+
 
 class GoogleSheetsSync:
     """Sync data from Google Sheets."""
     
+    # Flexible column mapping: field -> possible sheet header names
+    COLUMN_MAPPINGS = {
+        'control_no': ['Control No.', 'Control No', 'ID', 'Case ID', 'Control Number'],
+        'category': ['Category', 'Type', 'Issue Type'],
+        'sender_location': ['Sender\'s Location', 'Location', 'Address'],
+        'cluster': ['Cluster', 'Cluster Group', 'Group'],  # Column D
+        'barangay': ['Barangay', 'Brgy'],
+        'description': ['Description', 'Details'],
+        'attached_media': ['Attached Media', 'Media', 'Attachments', 'Image/Video'],  # Media URLs
+        'date_created': ['Date Created', 'Date', 'Created At'],
+        'reported_by': ['Reported by', 'Reporter', 'Name'],
+        'contact_number': ['Contact Number', 'Contact', 'Phone'],
+        'office': ['Office', 'Office Code', 'Assigned Office'],  # Column I
+        'link_to_report': ['Link to Report', 'Link', 'URL'],
+        'mynaga_app_status': ['MyNaga App Status', 'App Status', 'MyNaga Status'],  # Column M
+        'updates_sent_to_user_new': ['Updates Sent to User', 'Auto Response', 'Message'],  # Column N
+        'status': ['OPEN/RESOLVED/FOR REROUTING', 'Status', 'Case Status'],
+    }
+    
     def __init__(self, sheet_url: str, db: Session, credentials_json: Optional[str] = None):
         """
         Initialize Google Sheets sync.
@@ -25,6 +53,7 @@ class GoogleSheetsSync:
         """
         self.sheet_url = sheet_url
         self.db = db
+        self._pending_csv_validators: Optional[Dict[str, Optional[str]]] = None
         self.credentials_json = credentials_json
         self.use_service_account = credentials_json is not None
         
@@ -57,51 +86,89 @@ class GoogleSheetsSync:
         match = re.search(pattern, url)
         return int(match.group(1)) if match else None
     
-    async def fetch_sheet_data(self) -> List[Dict[str, Any]]:
+    async def fetch_sheet_data(self, if_changed: bool = False) -> Optional[List[Dict[str, Any]]]:
         """
         Fetch data from Google Sheets (via CSV or API).
         
+        Args:
+            if_changed: Return None instead of rows when the published CSV
+                is identical to the last synced version
+        
         Returns:
-            List of row dictionaries
+            List of row dictionaries, or None if unchanged
         """
         if self.use_service_account:
             return await self._fetch_via_api()
         else:
-            return await self._fetch_via_csv()
+            return await self._fetch_via_csv(if_changed)
     
-    async def _fetch_via_csv(self) -> List[Dict[str, Any]]:
-        """Fetch data via published CSV URL."""
+    async def _fetch_via_csv(self, if_changed: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Fetch data via published CSV URL, optionally short-circuiting unchanged content."""
+        previous = _csv_validators.get(self.csv_url) if if_changed else None
+        
+        # Let the server answer 304 when it supports validators
+        headers = {}
+        if previous:
+            if previous.get('etag'):
+                headers['If-None-Match'] = previous['etag']
+            if previous.get('last_modified'):
+                headers['If-Modified-Since'] = previous['last_modified']
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.csv_url) as response:
-                    if response.status == 200:
-                        csv_data = await response.text()
-                        return self._parse_csv(csv_data)
-                    elif response.status == 403:
-                        raise Exception(
-                            "Access denied. Please publish your sheet as CSV: "
-                            "File → Share → Publish to web → CSV format"
-                        )
-                    else:
-                        raise Exception(f"Failed to fetch sheet: {response.status}")
+            # Shared keep-alive pool of the running loop
+            session = get_http_session()
+            async with session.get(self.csv_url, headers=headers) as response:
+                if response.status == 304:
+                    logger.info("Google Sheet not modified (304), skipping parse")
+                    return None
+                elif response.status == 200:
+                    body = await response.read()
+                    validators = {
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'digest': hashlib.sha256(body).hexdigest(),
+                    }
+                        
+                    if previous and previous.get('digest') == validators['digest']:
+                        _csv_validators[self.csv_url] = validators
+                        logger.info("Google Sheet content unchanged, skipping parse")
+                        return None
+                        
+                    # Remembered only once the rows are committed
+                    self._pending_csv_validators = validators
+                    csv_data = body.decode(response.charset or 'utf-8')
+                    return self._parse_csv(csv_data)
+                elif response.status == 403:
+                    raise Exception(
+                        "Access denied. Please publish your sheet as CSV: "
+                        "File → Share → Publish to web → CSV format"
+                    )
+                else:
+                    raise Exception(f"Failed to fetch sheet: {response.status}")
         except Exception as e:
             logger.error(f"Error fetching Google Sheet: {str(e)}")
             raise
     
     async def _fetch_via_api(self) -> List[Dict[str, Any]]:
         """Fetch data via Google Sheets API (private sheets)."""
-        try:
-            from google_sheets_auth import GoogleSheetsAuthenticator
-            
-            auth = GoogleSheetsAuthenticator()
-            
-            # Set credentials from JSON string
-            if not auth.set_credentials_from_json(self.credentials_json):
+        from google.auth.exceptions import RefreshError
+        from google_sheets_auth import get_sheets_client, invalidate_sheets_clients, run_sheets_io
+        
+        auth = None
+        
+        def read_values():
+            nonlocal auth
+            auth = get_sheets_client(self.credentials_json)
+            if not auth:
                 raise Exception("Invalid service account credentials")
             
             # Fetch sheet data - pass gid if available to read the correct tab
+            return auth.read_sheet(self.sheet_id, range_name=None, gid=self.gid)
+        
+        try:
             logger.info(f"Fetching from sheet ID: {self.sheet_id}, gid: {self.gid}")
-            result = auth.read_sheet(self.sheet_id, range_name=None, gid=self.gid)
+            # Blocking API call runs on the Sheets I/O pool, off the event loop
+            result = await run_sheets_io(read_values)
             
             if not result or not result.get('values'):
                 return []
@@ -114,6 +181,9 @@ class GoogleSheetsSync:
             headers = values[0]
             logger.info(f"Found {len(headers)} columns: {', '.join(headers[:5])}...")
             
+            # Remember where each control number lives for write-back
+            _sheet_layouts[(self.sheet_id, self.gid)] = self._capture_layout(values)
+            
             rows = []
             
             for row_values in values[1:]:
@@ -131,10 +201,36 @@ class GoogleSheetsSync:
         except FileNotFoundError as e:
             logger.error(f"Spreadsheet not found: {str(e)}")
             raise Exception("Spreadsheet not found. Please check the URL.")
+        except RefreshError as e:
+            # Rebuild the client from the credentials on the next attempt
+            invalidate_sheets_clients(self.credentials_json)
+            logger.error(f"Access token refresh failed: {str(e)}")
+            raise Exception(f"Service account authentication failed: {str(e)}")
         except Exception as e:
             logger.error(f"Error fetching via API: {str(e)}")
             raise
     
+    def _capture_layout(self, values: List[List[str]]) -> Dict[str, Any]:
+        """
+        Index a sheet's rows by control number.
+        
+        Args:
+            values: Sheet values including the header row
+            
+        Returns:
+            Layout dictionary with headers, control_column and rows
+        """
+        headers = values[0]
+        control_column = _find_column(headers, 'control_no') or 0
+        
+        rows = {}
+        for offset, row_values in enumerate(values[1:]):
+            control_no = _cell(row_values, control_column)
+            if control_no:
+                rows.setdefault(control_no, offset + 2)  # Header is row 1
+        
+        return {'headers': headers, 'control_column': control_column, 'rows': rows}
+    
     def _parse_csv(self, csv_data: str) -> List[Dict[str, Any]]:
         """
         Parse CSV data into list of dictionaries.
@@ -168,29 +264,11 @@ class GoogleSheetsSync:
         Returns:
             CaseCreate object or None if invalid
         """
-        # Flexible column mapping
-        column_mappings = {
-            'control_no': ['Control No.', 'Control No', 'ID', 'Case ID', 'Control Number'],
-            'category': ['Category', 'Type', 'Issue Type'],
-            'sender_location': ['Sender\'s Location', 'Location', 'Address'],
-            'cluster': ['Cluster', 'Cluster Group', 'Group'],  # Column D
-            'barangay': ['Barangay', 'Brgy'],
-            'description': ['Description', 'Details'],
-            'attached_media': ['Attached Media', 'Media', 'Attachments', 'Image/Video'],  # Media URLs
-            'date_created': ['Date Created', 'Date', 'Created At'],
-            'reported_by': ['Reported by', 'Reporter', 'Name'],
-            'contact_number': ['Contact Number', 'Contact', 'Phone'],
-            'office': ['Office', 'Office Code', 'Assigned Office'],  # Column I
-            'link_to_report': ['Link to Report', 'Link', 'URL'],
-            'mynaga_app_status': ['MyNaga App Status', 'App Status', 'MyNaga Status'],  # Column M
-            'updates_sent_to_user_new': ['Updates Sent to User', 'Auto Response', 'Message'],  # Column N
-            'status': ['OPEN/RESOLVED/FOR REROUTING', 'Status', 'Case Status'],
-        }
         
         # Extract data using flexible mapping
         case_data = {}
         
-        for field, possible_columns in column_mappings.items():
+        for field, possible_columns in self.COLUMN_MAPPINGS.items():
             for col_name in possible_columns:
                 if col_name in row and row[col_name]:
                     case_data[field] = row[col_name]
@@ -259,6 +337,38 @@ class GoogleSheetsSync:
             logger.error(f"Error creating case from row: {str(e)}")
             return None
     
+    def _store_rows(self, rows: List[Dict[str, Any]], stats: Dict[str, Any]):
+        """
+        Map sheet rows to cases, write them in bulk and commit.
+        
+        Args:
+            rows: Sheet rows keyed by header
+            stats: Sync statistics to update
+        """
+        records = []
+        for idx, row in enumerate(rows):
+            try:
+                case_data = self._map_row_to_case(row)
+                
+                if not case_data:
+                    stats['skipped'] += 1
+                    continue
+                
+                records.append(case_data.dict())
+            
+            except Exception as e:
+                error_msg = f"Row {idx + 2}: {str(e)}"
+                stats['errors'].append(error_msg)
+                logger.error(error_msg)
+        
+        upsert_stats = bulk_upsert_cases(self.db, records, "sheet")
+        stats['created'] = upsert_stats['created']
+        stats['updated'] = upsert_stats['updated']
+        stats['unchanged'] = upsert_stats['unchanged']
+        
+        # Commit all changes
+        self.db.commit()
+    
     async def sync_to_database(self) -> Dict[str, Any]:
         """
         Sync Google Sheets data to database.
@@ -270,49 +380,30 @@ class GoogleSheetsSync:
             'fetched': 0,
             'created': 0,
             'updated': 0,
+            'unchanged': 0,
             'skipped': 0,
-            'errors': []
+            'not_modified': False,
+            'errors': [],
+            'timings': {}  # phase -> milliseconds
         }
         
         try:
             # Fetch data from sheet
-            rows = await self.fetch_sheet_data()
+            started = time.perf_counter()
+            rows = await self.fetch_sheet_data(if_changed=True)
+            stats['timings']['fetch_ms'] = int((time.perf_counter() - started) * 1000)
+            if rows is None:
+                stats['not_modified'] = True
+                return stats
             stats['fetched'] = len(rows)
             
-            # Process each row
-            for idx, row in enumerate(rows):
-                try:
-                    case_data = self._map_row_to_case(row)
-                    
-                    if not case_data:
-                        stats['skipped'] += 1
-                        continue
-                    
-                    # Check if case already exists
-                    existing = self.db.query(Case).filter(
-                        Case.control_no == case_data.control_no
-                    ).first()
-                    
-                    if existing:
-                        # Update existing case
-                        for key, value in case_data.dict().items():
-                            if value is not None:
-                                setattr(existing, key, value)
-                        existing.updated_at = datetime.utcnow()
-                        stats['updated'] += 1
-                    else:
-                        # Create new case
-                        new_case = Case(**case_data.dict())
-                        self.db.add(new_case)
-                        stats['created'] += 1
-                
-                except Exception as e:
-                    error_msg = f"Row {idx + 2}: {str(e)}"
-                    stats['errors'].append(error_msg)
-                    logger.error(error_msg)
+            # Mapping and the bulk write are blocking too; keep them off the loop
+            started = time.perf_counter()
+            await asyncio.to_thread(self._store_rows, rows, stats)
+            stats['timings']['store_ms'] = int((time.perf_counter() - started) * 1000)
             
-            # Commit all changes
-            self.db.commit()
+            if self._pending_csv_validators:
+                _csv_validators[self.csv_url] = self._pending_csv_validators
             
             return stats
             
@@ -336,32 +427,175 @@ async def sync_from_google_sheets(sheet_url: str, db: Session) -> Dict[str, Any]
     return await syncer.sync_to_database()
 
 
-def write_case_to_sheet(
-    case_data: Dict[str, Any],
+def _cell(row: List[Any], index: int) -> str:
+    """Stripped string value of a cell, or '' if the row is too short."""
+    return str(row[index]).strip() if len(row) > index and row[index] is not None else ''
+
+
+def _column_letter(index: int) -> str:
+    """Convert a 0-based column index to A1 column letters."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _find_column(headers: List[str], field: str) -> Optional[int]:
+    """Index of the first header that maps to a case field, or None."""
+    for name in GoogleSheetsSync.COLUMN_MAPPINGS.get(field, []):
+        if name in headers:
+            return headers.index(name)
+    return None
+
+
+# Case fields the dashboard edits and writes back to the sheet
+SHEET_WRITE_FIELDS = ['cluster', 'office', 'mynaga_app_status', 'updates_sent_to_user_new']
+
+
+def _get_layout(auth, spreadsheet_id: str, gid: Optional[int], sheet_name: str) -> Dict[str, Any]:
+    """
+    Get the cached sheet layout, reading just the header row if no sync captured it.
+    """
+    layout = _sheet_layouts.setdefault(
+        (spreadsheet_id, gid),
+        {'headers': None, 'control_column': 0, 'rows': {}}
+    )
+    if layout['headers'] is None:
+        result = auth.read_sheet(spreadsheet_id, f"{sheet_name}!1:1")
+        values = (result or {}).get('values') or [[]]
+        layout['headers'] = values[0]
+        layout['control_column'] = _find_column(layout['headers'], 'control_no') or 0
+    return layout
+
+
+def _locate_rows(auth, spreadsheet_id: str, sheet_name: str, layout: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Re-index control numbers from the control number column only.
+    
+    Used when the cached layout misses a control number or is out of date.
+    
+    Returns:
+        Dictionary of control_no -> sheet row number
+    """
+    letter = _column_letter(layout['control_column'])
+    
+    result = auth.read_sheet(spreadsheet_id, f"{sheet_name}!{letter}:{letter}")
+    rows = {}
+    for offset, row_values in enumerate((result or {}).get('values', [])):
+        value = _cell(row_values, 0)
+        if value:
+            rows.setdefault(value, offset + 1)
+    
+    layout['rows'] = rows
+    return rows
+
+
+def _resolve_rows(
+    auth,
+    spreadsheet_id: str,
+    sheet_name: str,
+    layout: Dict[str, Any],
+    control_nos: List[str]
+) -> Dict[str, int]:
+    """
+    Find the sheet row of each control number.
+    
+    Indexed rows are confirmed with one batched read of their control
+    number cells; misses and shifted rows trigger a single re-index.
+    
+    Returns:
+        Dictionary of control_no -> row number for the control numbers found
+    """
+    letter = _column_letter(layout['control_column'])
+    indexed = {c: layout['rows'][c] for c in control_nos if c in layout['rows']}
+    
+    confirmed = {}
+    if indexed:
+        ranges = [f"{sheet_name}!{letter}{row}" for row in indexed.values()]
+        for (control_no, row), values in zip(indexed.items(), auth.batch_read_sheet(spreadsheet_id, ranges)):
+            if values and _cell(values[0], 0) == control_no:
+                confirmed[control_no] = row
+    
+    if len(confirmed) < len(control_nos):
+        rows = _locate_rows(auth, spreadsheet_id, sheet_name, layout)
+        for control_no in control_nos:
+            if control_no not in confirmed and control_no in rows:
+                confirmed[control_no] = rows[control_no]
+    
+    return confirmed
+
+
+def _cell_updates(
+    sheet_name: str,
+    layout: Dict[str, Any],
+    row_number: int,
+    case_data: Dict[str, Any]
+) -> List[Tuple[str, List[List[Any]]]]:
+    """
+    Build single-cell updates for the dashboard-owned fields present in case_data.
+    
+    Columns come from the sheet's header row, so only the edited cells
+    are written and other columns are never touched.
+    """
+    case_data = dict(case_data)
+    if 'updates_sent_to_user' in case_data:
+        # Legacy payload key for Column N
+        case_data.setdefault('updates_sent_to_user_new', case_data.pop('updates_sent_to_user'))
+    
+    updates = []
+    for field in SHEET_WRITE_FIELDS:
+        if field not in case_data:
+            continue
+        value = case_data[field] if case_data[field] is not None else ''
+        
+        # Auto-response is only written when there is one
+        if field == 'updates_sent_to_user_new' and not value:
+            continue
+        
+        column = _find_column(layout['headers'], field)
+        if column is None:
+            logger.warning(f"No sheet column for {field}, not writing it")
+            continue
+        
+        updates.append((f"{sheet_name}!{_column_letter(column)}{row_number}", [[value]]))
+    
+    return updates
+
+
+def write_cases_to_sheet(
+    cases: List[Dict[str, Any]],
     sheet_url: str,
     credentials_json: str
-) -> bool:
+) -> Dict[str, Optional[str]]:
     """
-    Write updated case data back to Google Sheets.
+    Write edited case fields back to Google Sheets in one batchUpdate call.
+    
+    Only the dashboard-owned fields present in each case dictionary
+    (Cluster, Office, MyNaga App Status, Updates Sent to User) are sent,
+    each as its own single-cell range.
     
     Args:
-        case_data: Dictionary containing case data with control_no
+        cases: Case data dictionaries, each with control_no
         sheet_url: Google Sheets URL
         credentials_json: Service account credentials JSON string
         
     Returns:
-        True if successful, False otherwise
+        Dictionary of control_no -> None if written, else an error message
     """
-    from google_sheets_auth import GoogleSheetsAuthenticator
+    from google.auth.exceptions import RefreshError
+    from google_sheets_auth import get_sheets_client, invalidate_sheets_clients
     import re
     
+    results: Dict[str, Optional[str]] = {}
+    
     try:
         # Extract spreadsheet ID and gid
         pattern = r'/spreadsheets/d/([a-zA-Z0-9-_]+)'
         match = re.search(pattern, sheet_url)
         if not match:
-            logger.error("Invalid sheet URL")
-            return False
+            raise ValueError("Invalid sheet URL")
         
         spreadsheet_id = match.group(1)
         
@@ -370,88 +604,74 @@ def write_case_to_sheet(
         gid_match = re.search(gid_pattern, sheet_url)
         gid = int(gid_match.group(1)) if gid_match else None
         
-        # Initialize authenticator
-        auth = GoogleSheetsAuthenticator()
-        if not auth.set_credentials_from_json(credentials_json):
-            logger.error("Failed to set credentials")
-            return False
+        # Reuse the cached authenticated client
+        auth = get_sheets_client(credentials_json)
+        if not auth:
+            raise ValueError("Failed to set credentials")
         
         # Get sheet name from gid
         sheet_name = auth.get_sheet_name_by_gid(spreadsheet_id, gid) if gid else "Main"
         if not sheet_name:
             sheet_name = "Main"
         
-        logger.info(f"Writing to sheet: {sheet_name}")
-        
-        # Find row by control number
-        control_no = case_data.get('control_no')
-        if not control_no:
-            logger.error("No control_no in case data")
-            return False
-        
-        row_number = auth.find_row_by_control_no(spreadsheet_id, sheet_name, control_no)
-        if not row_number:
-            logger.error(f"Case {control_no} not found in sheet")
-            return False
-        
-        logger.info(f"Found case {control_no} at row {row_number}")
-        
-        # Map case data to sheet columns based on actual spreadsheet structure
-        # Column order from the spreadsheet (based on AppScript):
-        # A: Control No.
-        # B: (unknown/not mapped yet)
-        # C: Category
-        # D: Cluster
-        # E-H: (other fields like Location, Barangay, Description, Date, Reported by, Contact)
-        # I: Office
-        # J-L: (other fields)
-        # M: MyNaga App Status
-        # N: Updates Sent to User (Auto-response message)
-        # K or other: OPEN/RESOLVED/FOR REROUTING (Status)
-        
-        # For now, we'll update the key columns that are editable in your dashboard
-        # We need to read the full row first to preserve other data
-        
-        # Read the entire row
-        full_row_data = auth.read_sheet(spreadsheet_id, f"{sheet_name}!A{row_number}:Z{row_number}")
-        if not full_row_data or 'values' not in full_row_data or not full_row_data['values']:
-            logger.error(f"Could not read row {row_number}")
-            return False
-        
-        existing_row = full_row_data['values'][0] if full_row_data['values'] else []
-        
-        # Ensure the row has enough columns (at least 14 for column N)
-        while len(existing_row) < 14:
-            existing_row.append('')
-        
-        # Update only the specific columns we want to sync
-        # Column D (index 3): Cluster
-        existing_row[3] = case_data.get('cluster', existing_row[3] if len(existing_row) > 3 else '')
-        
-        # Column I (index 8): Office
-        existing_row[8] = case_data.get('office', existing_row[8] if len(existing_row) > 8 else '')
-        
-        # Column M (index 12): MyNaga App Status
-        existing_row[12] = case_data.get('mynaga_app_status', existing_row[12] if len(existing_row) > 12 else '')
-        
-        # Column N (index 13): Updates Sent to User (auto-response)
-        # Only update if explicitly provided, otherwise keep existing
-        if 'updates_sent_to_user' in case_data and case_data['updates_sent_to_user']:
-            existing_row[13] = case_data.get('updates_sent_to_user', '')
-        elif 'updates_sent_to_user_new' in case_data and case_data['updates_sent_to_user_new']:
-            existing_row[13] = case_data.get('updates_sent_to_user_new', '')
-        
-        # Update the row in the sheet (A to N)
-        range_name = f"{sheet_name}!A{row_number}:N{row_number}"
-        success = auth.write_to_sheet(spreadsheet_id, range_name, [existing_row[:14]])
-        
-        if success:
-            logger.info(f"Successfully wrote case {control_no} to Google Sheets")
-        else:
-            logger.error(f"Failed to write case {control_no} to Google Sheets")
+        logger.info(f"Writing {len(cases)} case(s) to sheet: {sheet_name}")
+        
+        layout = _get_layout(auth, spreadsheet_id, gid, sheet_name)
+        control_nos = [case_data.get('control_no') for case_data in cases if case_data.get('control_no')]
+        rows = _resolve_rows(auth, spreadsheet_id, sheet_name, layout, control_nos)
+        
+        data = []
+        for case_data in cases:
+            control_no = case_data.get('control_no')
+            if not control_no:
+                logger.error("No control_no in case data")
+                continue
+            if control_no not in rows:
+                logger.error(f"Case {control_no} not found in sheet")
+                results[control_no] = f"Case {control_no} not found in sheet"
+                continue
+            
+            logger.info(f"Found case {control_no} at row {rows[control_no]}")
+            data.extend(_cell_updates(sheet_name, layout, rows[control_no], case_data))
+            results[control_no] = None
+        
+        if data and not auth.batch_write_to_sheet(spreadsheet_id, data):
+            for control_no, error in results.items():
+                if error is None:
+                    results[control_no] = "Write to Google Sheets failed"
+        
+        for control_no, error in results.items():
+            if error is None:
+                logger.info(f"Successfully wrote case {control_no} to Google Sheets")
         
-        return success
+        return results
         
+    except RefreshError as e:
+        invalidate_sheets_clients(credentials_json)
+        logger.error(f"Access token refresh failed: {str(e)}")
+        error = f"Access token refresh failed: {str(e)}"
     except Exception as e:
         logger.error(f"Error writing to sheet: {str(e)}")
-        return False
+        error = str(e)
+    
+    return {case_data.get('control_no'): error for case_data in cases}
+
+
+def write_case_to_sheet(
+    case_data: Dict[str, Any],
+    sheet_url: str,
+    credentials_json: str
+) -> bool:
+    """
+    Write updated case data back to Google Sheets.
+    
+    Args:
+        case_data: Dictionary containing case data with control_no
+        sheet_url: Google Sheets URL
+        credentials_json: Service account credentials JSON string
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    results = write_cases_to_sheet([case_data], sheet_url, credentials_json)
+    return results.get(case_data.get('control_no'), "missing") is None
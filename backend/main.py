@@ -1,9 +1,10 @@
 """FastAPI main application."""
-from fastapi import FastAPI, Depends, UploadFile, File, HTTPException, Query
+from fastapi import FastAPI, Depends, UploadFile, File, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, noload
 from datetime import datetime
-from typing import List
+from typing import List, Optional
+import base64
 import os
 import tempfile
 import logging
@@ -16,11 +17,18 @@ from schemas import (
     OfficeCreate, OfficeResponse,
     ClusterCreate, ClusterResponse, ClusterUpdate,
     TagCreate, TagResponse,
-    StatsResponse
+    CaseUpdateCreate, CaseUpdateResponse,
+    StatsResponse, CaseChangesResponse
 )
 from excel_importer import ExcelImporter
+from case_search import apply_search
+from case_stats import read_stats, rebuild_case_counters
+from case_feed import current_sequence, read_case_changes
+from sheets_outbox import enqueue_case_write
 from mynaga_routes import router as mynaga_router
 from google_sheets_routes import router as google_sheets_router
+from sync_routes import router as sync_router
+from events_routes import router as events_router
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -39,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Initialize database on startup
@@ -46,20 +55,82 @@ app.add_middleware(
 def startup_event():
     """Initialize database on startup."""
     init_db()
-    # Note: MyNaga sync will be initialized via API endpoint /api/mynaga/config
+    
+    # Resume the auto-syncs configured before the last restart; new ones are
+    # set up via /api/mynaga/config and /api/google-sheets/auto-sync/start
+    from scheduler import resume_sync_jobs
+    resume_sync_jobs()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background syncs and close pooled HTTP connections."""
+    from scheduler import stop_scheduler
+    from sync_runtime import close_http_sessions
+    
+    stop_scheduler()
+    await close_http_sessions()
 
 
 # Include integration routes
 app.include_router(mynaga_router)
 app.include_router(google_sheets_router)
+app.include_router(sync_router)
+app.include_router(events_router)
 
 
 # ============================================================================
 # CASES ENDPOINTS
 # ============================================================================
 
+def _encode_cursor(case_id: int) -> str:
+    """Encode the last case ID of a page into an opaque cursor token."""
+    return base64.urlsafe_b64encode(f"id:{case_id}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> int:
+    """Decode a cursor token produced by _encode_cursor back into a case ID."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, _, value = base64.urlsafe_b64decode(padded.encode()).decode().partition(":")
+        if prefix != "id":
+            raise ValueError(cursor)
+        return int(value)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Relationships of CaseResponse that list endpoints may batch-load or skip
+CASE_INCLUDES = {
+    "tags": Case.tags,
+    "updates": Case.updates,
+}
+
+
+def _case_load_options(include: str) -> list:
+    """
+    Build loader options for the CaseResponse relationships.
+    
+    Requested relationships are loaded with one SELECT ... IN query per
+    relationship for the whole page; the rest are not loaded at all.
+    """
+    requested = {name.strip() for name in include.split(",") if name.strip()}
+    unknown = requested - CASE_INCLUDES.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}"
+        )
+    
+    return [
+        selectinload(attr) if name in requested else noload(attr)
+        for name, attr in CASE_INCLUDES.items()
+    ]
+
+
 @app.get("/api/cases", response_model=List[CaseResponse])
 def get_cases(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(10000, ge=1, le=50000),
@@ -67,9 +138,25 @@ def get_cases(
     category: str = Query(None),
     barangay: str = Query(None),
     search: str = Query(None),
+    after_id: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = Query(None),
+    include: str = Query("tags,updates"),
 ):
-    """Get all cases with optional filtering."""
-    query = db.query(Case)
+    """
+    Get all cases with optional filtering.
+    
+    Pages can be fetched by offset (skip/limit) or by keyset: pass the
+    X-Next-Cursor header of the previous page as `cursor` (or the last seen
+    case ID as `after_id`) to seek directly on the primary key.
+    
+    Searches use the full-text index and are ranked by relevance in offset
+    mode, and those pages carry no cursor (page them with skip); keyset
+    pages always follow ID order.
+    
+    `include` lists the relationships to embed (default "tags,updates");
+    pass an empty value to skip them for table views.
+    """
+    query = db.query(Case).options(*_case_load_options(include))
     
     if status:
         query = query.filter(Case.status == status)
@@ -77,20 +164,68 @@ def get_cases(
         query = query.filter(Case.category == category)
     if barangay:
         query = query.filter(Case.barangay == barangay)
+    relevance = None
     if search:
-        query = query.filter(
-            (Case.control_no.ilike(f"%{search}%")) |
-            (Case.description.ilike(f"%{search}%")) |
-            (Case.reported_by.ilike(f"%{search}%"))
-        )
-    
-    # Order by most recent cases first (by ID descending)
+        query, relevance = apply_search(query, search)
+    
+    # Keyset mode: seek past the last seen ID instead of skipping rows
+    if cursor:
+        after_id = _decode_cursor(cursor)
+    if after_id is not None:
+        query = query.filter(Case.id < after_id)
+        skip = 0
+        relevance = None  # Keyset pages need a stable ID order
+    
+    # Best search matches first, then most recent cases (by ID descending)
+    if relevance:
+        query = query.order_by(*relevance)
     query = query.order_by(Case.id.desc())
     
     cases = query.offset(skip).limit(limit).all()
+    
+    # A full page means there may be more rows after it. Relevance-ranked
+    # pages get no cursor: the ID seek would skip matches, so use skip instead
+    if len(cases) == limit and not relevance:
+        response.headers["X-Next-Cursor"] = _encode_cursor(cases[-1].id)
+    
     return cases
 
 
+@app.get("/api/cases/changes", response_model=CaseChangesResponse)
+def get_case_changes(
+    db: Session = Depends(get_db),
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    include: str = Query("tags,updates"),
+):
+    """
+    Get the cases inserted, updated or deleted after a change sequence number.
+    
+    Call without `since` to get the current sequence number, then load the
+    case list and poll (or react to cases_changed events) with
+    `since=<next_since>`. Changed cases are returned in their current state;
+    deleted ones as tombstones. When has_more is set, call again right away.
+    When reset is set, the feed no longer covers `since`: reload the list.
+    """
+    if since is None:
+        return CaseChangesResponse(next_since=current_sequence(db))
+    
+    feed = read_case_changes(db, since, limit)
+    cases = []
+    if feed["case_ids"]:
+        cases = db.query(Case).options(*_case_load_options(include)).filter(
+            Case.id.in_(feed["case_ids"])
+        ).order_by(Case.id.desc()).all()
+    
+    return CaseChangesResponse(
+        changes=cases,
+        deleted=feed["deleted"],
+        next_since=feed["next_since"],
+        has_more=feed["has_more"],
+        reset=feed["reset"],
+    )
+
+
 @app.get("/api/cases/{case_id}", response_model=CaseResponse)
 def get_case(case_id: int, db: Session = Depends(get_db)):
     """Get a specific case by ID."""
@@ -127,58 +262,26 @@ def update_case(
         raise HTTPException(status_code=404, detail="Case not found")
     
     update_data = case_update.dict(exclude_unset=True)
+    # Clients send the whole form; only fields that differ are written back
+    changed = {key for key, value in update_data.items() if getattr(db_case, key) != value}
     for key, value in update_data.items():
         setattr(db_case, key, value)
     
     db_case.updated_at = datetime.utcnow()
+    db_case.sheet_hash = None  # Let the next sheet sync reconcile this row (after any write-back)
+    
+    # Two-way sync: queue the changed sheet cells in the same transaction;
+    # the outbox worker sends them in the background
+    # (published-CSV syncs are read-only, so nothing would ever drain the queue)
+    from scheduler import sync_manager
+    if sync_manager.writes_back_to_sheet():
+        enqueue_case_write(db, db_case, changed)
+    else:
+        logger.debug("Google Sheets write-back not configured, skipping")
+    
     db.commit()
     db.refresh(db_case)
     
-    # Two-way sync: Write changes back to Google Sheets
-    try:
-        from scheduler import sync_manager
-        from google_sheets_sync import write_case_to_sheet
-        
-        # Check if Google Sheets is configured
-        if sync_manager.sheets_config:
-            logger.info(f"Syncing case {db_case.control_no} back to Google Sheets...")
-            
-            # Prepare case data for writing
-            case_data = {
-                'control_no': db_case.control_no,
-                'category': db_case.category,
-                'sender_location': db_case.sender_location,
-                'cluster': db_case.cluster or '',  # Column D
-                'barangay': db_case.barangay,
-                'description': db_case.description,
-                'date_created': db_case.date_created.isoformat() if db_case.date_created else '',
-                'reported_by': db_case.reported_by or '',
-                'contact_number': db_case.contact_number or '',
-                'office': db_case.office or '',  # Column I
-                'link_to_report': db_case.link_to_report or '',
-                'mynaga_app_status': db_case.mynaga_app_status or '',  # Column M
-                'updates_sent_to_user': db_case.updates_sent_to_user_new or '',  # Column N (use _new field)
-                'status': db_case.status or 'OPEN',
-            }
-            
-            # Write to Google Sheets
-            success = write_case_to_sheet(
-                case_data=case_data,
-                sheet_url=sync_manager.sheets_config.get('sheet_url'),
-                credentials_json=sync_manager.sheets_config.get('credentials_json')
-            )
-            
-            if success:
-                logger.info(f"✅ Case {db_case.control_no} synced to Google Sheets")
-            else:
-                logger.warning(f"⚠️ Failed to sync case {db_case.control_no} to Google Sheets")
-        else:
-            logger.debug("Google Sheets not configured, skipping write-back")
-            
-    except Exception as e:
-        # Don't fail the update if Google Sheets sync fails
-        logger.error(f"Error syncing to Google Sheets: {str(e)}")
-    
     return db_case
 
 
@@ -337,10 +440,10 @@ def delete_tag(tag_id: int, db: Session = Depends(get_db)):
 # CASE UPDATES ENDPOINTS
 # ============================================================================
 
-@app.post("/api/cases/{case_id}/updates")
+@app.post("/api/cases/{case_id}/updates", response_model=CaseUpdateResponse)
 def add_case_update(
     case_id: int,
-    update: CaseUpdateSchema,
+    update: CaseUpdateCreate,
     db: Session = Depends(get_db)
 ):
     """Add an update to a case."""
@@ -408,27 +511,14 @@ def export_excel(db: Session = Depends(get_db)):
 
 @app.get("/api/stats", response_model=StatsResponse)
 def get_stats(db: Session = Depends(get_db)):
-    """Get dashboard statistics."""
-    total_cases = db.query(Case).count()
-    open_cases = db.query(Case).filter(Case.status == "OPEN").count()
-    resolved_cases = db.query(Case).filter(Case.status == "RESOLVED").count()
-    rerouting_cases = db.query(Case).filter(Case.status == "FOR REROUTING").count()
-    total_offices = db.query(Office).filter(Office.is_active == True).count()
-    total_clusters = db.query(Cluster).count()
-    
-    # Calculate average case aging
-    avg_aging = db.query(Case).filter(Case.case_aging != None).all()
-    average_case_aging = sum([c.case_aging for c in avg_aging]) / len(avg_aging) if avg_aging else 0
-    
-    return StatsResponse(
-        total_cases=total_cases,
-        open_cases=open_cases,
-        resolved_cases=resolved_cases,
-        rerouting_cases=rerouting_cases,
-        total_offices=total_offices,
-        total_clusters=total_clusters,
-        average_case_aging=average_case_aging
-    )
+    """Get dashboard statistics from the maintained case counters."""
+    stats = read_stats(db)
+    if stats is None:
+        rebuild_case_counters(db)
+        db.commit()
+        stats = read_stats(db)
+    
+    return StatsResponse(**stats)
 
 
 @app.get("/api/mynaga-stats")
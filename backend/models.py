@@ -1,7 +1,7 @@
 """Database models for MyNaga Dashboard."""
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Table, BigInteger
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import column_property, relationship
 from datetime import datetime
 
 Base = declarative_base()
@@ -48,12 +48,16 @@ class Case(Base):
     hours_before_deployed = Column(Integer)
     last_status_update_datetime = Column(DateTime)
     screened_by = Column(String(255))
-    status = Column(String(50), default='OPEN')  # OPEN/RESOLVED/FOR REROUTING
+    # active_history: the old value is loaded on change, even when expired, for case_counters
+    status = column_property(Column(String(50), default='OPEN'), active_history=True)  # OPEN/RESOLVED/FOR REROUTING
     updates_sent = Column(Boolean, default=False)
-    case_aging = Column(Integer)  # days
+    case_aging = column_property(Column(Integer), active_history=True)  # days
     month = Column(String(20))
     feedback_marked = Column(Boolean, default=False)
     refined_category = Column(String(100))
+    mynaga_id = Column(String(50))  # MyNaga report _id (for report links)
+    sheet_hash = Column(String(64))  # Fingerprint of the last synced Google Sheets row
+    mynaga_hash = Column(String(64))  # Fingerprint of the last synced MyNaga report
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -125,3 +129,93 @@ class Tag(Base):
 
     # Relationships
     case = relationship("Case", back_populates="tags")
+
+
+class CaseCounters(Base):
+    """Pre-aggregated case statistics, kept in a single row (id=1)."""
+    __tablename__ = "case_counters"
+
+    id = Column(Integer, primary_key=True)
+    total_cases = Column(Integer, default=0, nullable=False)
+    open_cases = Column(Integer, default=0, nullable=False)
+    resolved_cases = Column(Integer, default=0, nullable=False)
+    rerouting_cases = Column(Integer, default=0, nullable=False)
+    aging_sum = Column(BigInteger, default=0, nullable=False)  # Sum of non-null case_aging
+    aging_count = Column(Integer, default=0, nullable=False)  # Cases with case_aging set
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SheetWriteOutbox(Base):
+    """Pending write-backs of case edits to Google Sheets."""
+    __tablename__ = "sheet_write_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    control_no = Column(String(50), index=True)
+    payload = Column(Text)  # JSON of the changed sheet fields for write_cases_to_sheet
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SyncLease(Base):
+    """Time-limited lease electing the one process that runs background syncs."""
+    __tablename__ = "sync_leases"
+
+    name = Column(String(50), primary_key=True)
+    holder = Column(String(255))  # "hostname:pid" of the leader
+    acquired_at = Column(DateTime)
+    expires_at = Column(DateTime)
+
+
+class SyncJobConfig(Base):
+    """Saved configuration of a scheduled sync job, resumed on startup."""
+    __tablename__ = "sync_job_configs"
+
+    name = Column(String(50), primary_key=True)  # "google_sheets" or "mynaga"
+    config = Column(Text)  # JSON job arguments (sheet URL, credentials, token)
+    interval_seconds = Column(Integer, nullable=False)
+    enabled = Column(Boolean, default=True, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SyncWatermark(Base):
+    """High-water mark of an incremental sync job."""
+    __tablename__ = "sync_watermarks"
+
+    name = Column(String(50), primary_key=True)  # Job name, e.g. "mynaga"
+    last_seen_at = Column(DateTime)  # Newest date_created synced so far
+    last_full_sync_at = Column(DateTime)  # Last full reconciliation pass
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SyncRun(Base):
+    """History of sync runs (scheduled and manual)."""
+    __tablename__ = "sync_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job = Column(String(50), index=True)  # "google_sheets" or "mynaga"
+    trigger = Column(String(20))  # "scheduled" or "manual"
+    worker = Column(String(255))  # "hostname:pid" that ran it
+    status = Column(String(20))  # running, success, not_modified, failed
+    started_at = Column(DateTime, default=datetime.utcnow, index=True)
+    finished_at = Column(DateTime)
+    duration_ms = Column(Integer)
+    phase_timings = Column(Text)  # JSON phase -> milliseconds
+    rows_fetched = Column(Integer)
+    rows_created = Column(Integer)
+    rows_updated = Column(Integer)
+    rows_unchanged = Column(Integer)
+    rows_skipped = Column(Integer)
+    errors = Column(Text)  # JSON list of error messages
+
+
+class CaseChange(Base):
+    """Change log of case writes; the ID is the change feed sequence number."""
+    __tablename__ = "case_changes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    case_id = Column(Integer, index=True)  # No FK: deleted cases keep their entries
+    control_no = Column(String(50))
+    action = Column(String(10))  # created, updated, deleted
+    changed_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -1,12 +1,21 @@
 """Real-time MyNaga API integration endpoints."""
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from database import get_db
 from mynaga_sync import MyNagaSyncService
 from scheduler import sync_manager, init_scheduler, trigger_manual_sync
-from mynaga_link_service import get_mynaga_report_link
+from mynaga_link_service import (
+    load_stored_report_ids,
+    report_link,
+    resolve_report_ids,
+    save_report_ids,
+)
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+
+# Most control numbers accepted by one /report-links request
+MAX_REPORT_LINKS = 1000
 
 router = APIRouter(prefix="/api/mynaga", tags=["MyNaga Integration"])
 
@@ -17,11 +26,17 @@ class MyNagaConfig(BaseModel):
     sync_interval_minutes: Optional[int] = 5
 
 
+class ReportLinksRequest(BaseModel):
+    """Control numbers to resolve to MyNaga report links."""
+    control_nos: List[str]
+
+
 class SyncStatus(BaseModel):
     """Sync status response."""
     last_sync_time: Optional[str]
     last_sync_status: Optional[dict]
     is_syncing: bool
+    effective_interval_seconds: Optional[int] = None
 
 
 @router.post("/config")
@@ -85,11 +100,12 @@ def get_sync_status():
     Returns:
         Sync status information
     """
-    status = sync_manager.get_sync_status()
+    status = sync_manager.get_sync_status()["mynaga"]
     return {
         "last_sync_time": status["last_sync_time"].isoformat() if status["last_sync_time"] else None,
         "last_sync_status": status["last_sync_status"],
-        "is_syncing": status["is_syncing"]
+        "is_syncing": status["is_syncing"],
+        "effective_interval_seconds": status["effective_interval_seconds"]
     }
 
 
@@ -131,8 +147,8 @@ async def test_mynaga_connection(auth_token: str):
 def stop_sync():
     """Stop the automatic sync scheduler."""
     try:
-        from scheduler import stop_scheduler
-        stop_scheduler()
+        from scheduler import stop_mynaga_scheduler
+        stop_mynaga_scheduler()
         
         return {
             "success": True,
@@ -143,8 +159,31 @@ def stop_sync():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _resolve_report_links(db: Session, control_nos: List[str]) -> dict:
+    """
+    Resolve control numbers to report links, preferring IDs stored on cases.
+    
+    IDs fetched from the MyNaga API are stored on their cases.
+    
+    Returns:
+        Dictionary of control_no -> link (None if not found)
+    """
+    stored = await asyncio.to_thread(load_stored_report_ids, db, control_nos)
+    report_ids = {control_no: stored.get(control_no) for control_no in control_nos}
+    
+    unresolved = [control_no for control_no, mongo_id in report_ids.items() if not mongo_id]
+    if unresolved:
+        fetched = await resolve_report_ids(unresolved)
+        report_ids.update(fetched)
+        await asyncio.to_thread(
+            save_report_ids, db, {control_no: fetched.get(control_no) for control_no in unresolved if control_no in stored}
+        )
+    
+    return {control_no: report_link(mongo_id) if mongo_id else None for control_no, mongo_id in report_ids.items()}
+
+
 @router.get("/report-link/{control_no}")
-async def get_report_link(control_no: str):
+async def get_report_link(control_no: str, db: Session = Depends(get_db)):
     """
     Get MyNaga report link for a specific control number.
     
@@ -155,7 +194,8 @@ async def get_report_link(control_no: str):
         MyNaga report URL
     """
     try:
-        link = await get_mynaga_report_link(control_no)
+        control_no = control_no.strip()
+        link = (await _resolve_report_links(db, [control_no]))[control_no]
         
         if link:
             return {
@@ -173,3 +213,35 @@ async def get_report_link(control_no: str):
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching report link: {str(e)}")
+
+
+@router.post("/report-links")
+async def get_report_links(request: ReportLinksRequest, db: Session = Depends(get_db)):
+    """
+    Get MyNaga report links for many control numbers at once.
+    
+    Links already stored on cases are read from the database. The rest are
+    grouped by the date in their control number, each day is fetched from
+    the MyNaga API once, and the resolved IDs are stored on their cases.
+    
+    Args:
+        request: Control numbers (at most MAX_REPORT_LINKS)
+        
+    Returns:
+        Links keyed by control number (None if not found)
+    """
+    control_nos = list(dict.fromkeys(c.strip() for c in request.control_nos if c and c.strip()))
+    if len(control_nos) > MAX_REPORT_LINKS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_REPORT_LINKS} control numbers per request")
+    
+    try:
+        links = await _resolve_report_links(db, control_nos)
+        return {
+            "success": True,
+            "links": links,
+            "resolved": sum(1 for link in links.values() if link),
+            "missing": [control_no for control_no, link in links.items() if not link]
+        }
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching report links: {str(e)}")
@@ -1,16 +1,113 @@
 """MyNaga API integration for real-time data syncing."""
 import aiohttp
 import asyncio
-import ssl
-from datetime import datetime
-from typing import List, Dict, Optional, Any
+import time
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Dict, Optional, Any, Tuple
 import logging
 from sqlalchemy.orm import Session
-from models import Case, Office
+from config import settings
+from models import SyncWatermark
 from schemas import CaseCreate
+from case_upsert import bulk_upsert_cases
+from sync_runtime import get_http_session
 
 logger = logging.getLogger(__name__)
 
+# Watermark row of the MyNaga sync (same name as its sync job)
+WATERMARK_NAME = "mynaga"
+
+
+def _date_windows(
+    date_from: datetime,
+    date_to: datetime,
+    window_days: int
+) -> List[Tuple[datetime, datetime]]:
+    """Split [date_from, date_to) into windows starting at midnight boundaries."""
+    windows = []
+    start = datetime(date_from.year, date_from.month, date_from.day)
+    while start < date_to:
+        end = min(start + timedelta(days=window_days), date_to)
+        windows.append((start, end))
+        start = end
+    return windows
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Convert a timezone-aware timestamp to naive UTC, as stored in the database."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _iso(value: datetime) -> str:
+    """Format a timestamp the way the MyNaga API filters expect."""
+    return value.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+async def fetch_report_windows(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: Dict[str, str],
+    date_from: datetime,
+    date_to: Optional[datetime] = None,
+    params: Optional[Dict[str, str]] = None,
+    window_days: Optional[int] = None,
+    concurrency: Optional[int] = None
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Fetch reports created in a date range as concurrent per-window requests.
+    
+    The range is split into windows of window_days, which are fetched over
+    the given session with at most `concurrency` requests in flight. Each
+    window's reports are yielded as soon as they arrive (in completion
+    order), so callers can process them while the rest download.
+    
+    Args:
+        session: aiohttp session to fetch with
+        url: Reports endpoint URL
+        headers: Request headers (authorization)
+        date_from: Start of the range
+        date_to: End of the range, exclusive (default: end of today)
+        params: Extra query parameters for every request
+        window_days: Days per window (default: settings.mynaga_fetch_window_days)
+        concurrency: Requests in flight (default: settings.mynaga_fetch_concurrency)
+        
+    Yields:
+        List of report dictionaries for one window
+    """
+    if date_to is None:
+        today = datetime.utcnow()
+        date_to = datetime(today.year, today.month, today.day) + timedelta(days=1)
+    
+    semaphore = asyncio.Semaphore(concurrency or settings.mynaga_fetch_concurrency)
+    
+    async def fetch(start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        query = {**(params or {}), "date_created_from": _iso(start), "date_created_to": _iso(end)}
+        async with semaphore:
+            async with session.get(url, params=query, headers=headers) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise Exception(f"API request failed: {response.status} - {error_text}")
+                data = await response.json()
+        
+        if isinstance(data, dict):
+            if data.get("message") == "Unauthenticated.":
+                raise PermissionError("MyNaga API token is invalid or expired")
+            data = data.get("data", data.get("reports", []))
+        logger.debug(f"Fetched {len(data)} reports for {start:%Y-%m-%d} - {end:%Y-%m-%d}")
+        return data
+    
+    windows = _date_windows(date_from, date_to, window_days or settings.mynaga_fetch_window_days)
+    tasks = [asyncio.ensure_future(fetch(start, end)) for start, end in windows]
+    try:
+        for next_window in asyncio.as_completed(tasks):
+            yield await next_window
+    finally:
+        # Stop outstanding requests if the caller stops early or a window failed
+        for task in tasks:
+            task.cancel()
+
 
 class MyNagaAPIClient:
     """Client for MyNaga App API real-time data sync."""
@@ -37,23 +134,14 @@ class MyNagaAPIClient:
     
     async def __aenter__(self):
         """Async context manager entry."""
-        # Create SSL context that handles certificates properly
-        ssl_context = ssl.create_default_context()
-        # For development: you can uncomment the line below if you have SSL issues
-        # ssl_context.check_hostname = False
-        # ssl_context.verify_mode = ssl.CERT_NONE
-        
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        self.session = aiohttp.ClientSession(
-            headers=self.headers,
-            connector=connector
-        )
+        # Shared keep-alive pool for the running loop; headers go per request
+        self.session = get_http_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
-            await self.session.close()
+        # The shared session stays open for the next sync
+        self.session = None
     
     async def fetch_reports(
         self,
@@ -71,7 +159,7 @@ class MyNagaAPIClient:
             List of report dictionaries
         """
         if not self.session:
-            await self._initialize_session()
+            self.session = get_http_session()
         
         # Build query parameters to match AppScript implementation
         params = {
@@ -88,7 +176,7 @@ class MyNagaAPIClient:
             url = f"{self.BASE_URL}/reports"
             logger.info(f"Fetching reports from: {url} with params: {params}")
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(url, params=params, headers=self.headers) as response:
                 if response.status == 200:
                     data = await response.json()
                     # API returns array of report objects
@@ -102,6 +190,33 @@ class MyNagaAPIClient:
         except Exception as e:
             logger.error(f"Error fetching reports: {str(e)}")
             raise
+    
+    def fetch_report_windows(
+        self,
+        date_from: datetime,
+        date_to: Optional[datetime] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Fetch reports in concurrent date windows over the shared session.
+        
+        Args:
+            date_from: Start date
+            date_to: End date, exclusive (default: end of today)
+            
+        Returns:
+            Async iterator of per-window report lists (see fetch_report_windows)
+        """
+        if not self.session:
+            self.session = get_http_session()
+        
+        return fetch_report_windows(
+            self.session,
+            f"{self.BASE_URL}/reports",
+            self.headers,
+            date_from,
+            date_to,
+            params={"filter_cancel": "1"}  # Filter out cancelled reports
+        )
 
 
 class MyNagaSyncService:
@@ -189,10 +304,119 @@ class MyNagaSyncService:
         }
         return status_map.get(mynaga_status.lower(), "OPEN")
     
-    async def sync_reports(self) -> Dict:
+    def _store_reports(self, reports: List[Dict[str, Any]], stats: Dict) -> Optional[datetime]:
+        """
+        Map reports to cases, upsert them keyed by control number and commit.
+        
+        Args:
+            reports: Report dictionaries from the MyNaga API
+            stats: Sync statistics to update
+            
+        Returns:
+            Newest date_created among the stored reports (naive UTC), if any
+        """
+        records = []
+        for report in reports:
+            control_number = (report.get("control_number") or "").strip()
+            if not control_number:
+                stats["skipped"] += 1
+                continue
+            
+            try:
+                case_data = self._map_mynaga_to_case(report)
+                case_data.control_no = control_number
+                record = case_data.dict()
+                record["mynaga_id"] = (report.get("_id") or "").strip() or None
+                records.append(record)
+            except Exception as e:
+                logger.error(f"Error processing report {control_number}: {e}")
+                stats["errors"] += 1
+                stats["error_messages"].append(f"{control_number}: {e}")
+        
+        upsert_stats = bulk_upsert_cases(self.db, records, "mynaga")
+        stats["created"] += upsert_stats["created"]
+        stats["updated"] += upsert_stats["updated"]
+        stats["unchanged"] += upsert_stats["unchanged"]
+        
+        # Commit all changes
+        self.db.commit()
+        
+        newest = None
+        for report in reports:
+            try:
+                created_at = _naive_utc(datetime.fromisoformat(report["date_created"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+            if newest is None or created_at > newest:
+                newest = created_at
+        return newest
+    
+    def _plan_sync(self, full: bool) -> Tuple[bool, datetime]:
+        """
+        Decide between a full and an incremental sync and where it starts.
+        
+        Incremental syncs start mynaga_recheck_days before the newest report
+        seen, so recent reports are re-checked for status changes. The API
+        only filters on date_created, so edits to older reports are picked up
+        by the full pass over the month every mynaga_full_sync_hours.
+        
+        Args:
+            full: Force a full sync
+            
+        Returns:
+            Tuple of (full, date_from)
+        """
+        now = datetime.utcnow()
+        month_start = datetime(now.year, now.month, 1)
+        mark = self.db.get(SyncWatermark, WATERMARK_NAME)
+        
+        if (
+            full
+            or mark is None
+            or mark.last_seen_at is None
+            or mark.last_full_sync_at is None
+            or mark.last_full_sync_at < month_start
+            or now - mark.last_full_sync_at >= timedelta(hours=settings.mynaga_full_sync_hours)
+        ):
+            return True, month_start
+        
+        return False, max(mark.last_seen_at - timedelta(days=settings.mynaga_recheck_days), month_start)
+    
+    def _save_watermark(self, last_seen_at: Optional[datetime], full: bool, started_at: datetime):
+        """
+        Advance the sync watermark after a successful fetch.
+        
+        Args:
+            last_seen_at: Newest date_created fetched in this run (None if none)
+            full: Whether this run was a full sync
+            started_at: When this run started
+        """
+        mark = self.db.get(SyncWatermark, WATERMARK_NAME)
+        if mark is None:
+            mark = SyncWatermark(name=WATERMARK_NAME)
+            self.db.add(mark)
+        
+        # Never move backwards, e.g. when a recheck window comes back empty
+        if last_seen_at and (mark.last_seen_at is None or last_seen_at > mark.last_seen_at):
+            mark.last_seen_at = last_seen_at
+        if full:
+            mark.last_full_sync_at = started_at
+        self.db.commit()
+    
+    async def sync_reports(self, full: bool = False) -> Dict:
         """
         Sync reports from MyNaga API to database.
         
+        Only reports created since the stored watermark (minus a re-check
+        window) are requested, with a periodic full pass over the month;
+        see _plan_sync. Reports are fetched in concurrent date windows and
+        each window is upserted in bulk, keyed by control number, as soon as
+        it arrives: only that window's control numbers are looked up, and
+        only changed cases are written.
+        
+        Args:
+            full: Re-fetch the whole month regardless of the watermark
+        
         Returns:
             Dictionary with sync statistics
         """
@@ -200,49 +424,48 @@ class MyNagaSyncService:
             "total_fetched": 0,
             "created": 0,
             "updated": 0,
+            "unchanged": 0,
+            "skipped": 0,
             "errors": 0,
-            "error_messages": []
+            "error_messages": [],
+            "timings": {}  # phase -> milliseconds
         }
         
         try:
             async with self.client as client:
-                logger.info("Starting MyNaga sync...")
-                # Fetch reports from last 30 days by default
-                date_from = datetime.utcnow().replace(day=1)  # First day of current month
-                reports = await client.fetch_reports(date_from=date_from)
-                stats["total_fetched"] = len(reports)
+                sync_started_at = datetime.utcnow()
+                full, date_from = self._plan_sync(full)
+                stats["mode"] = "full" if full else "incremental"
+                stats["date_from"] = date_from.isoformat()
+                logger.info(f"Starting {stats['mode']} MyNaga sync from {date_from:%Y-%m-%d %H:%M}...")
+                
+                started = time.perf_counter()
+                store_seconds = 0.0
+                last_seen_at = None
+                
+                async for reports in client.fetch_report_windows(date_from):
+                    stats["total_fetched"] += len(reports)
+                    if not reports:
+                        continue
+                    
+                    # Mapping and the bulk write are blocking; keep them off the
+                    # loop while the remaining windows download
+                    store_started = time.perf_counter()
+                    newest = await asyncio.to_thread(self._store_reports, reports, stats)
+                    store_seconds += time.perf_counter() - store_started
+                    if newest and (last_seen_at is None or newest > last_seen_at):
+                        last_seen_at = newest
                 
-                for report in reports:
-                    try:
-                        # Check if case already exists
-                        existing_case = self.db.query(Case).filter(
-                            Case.control_no == report.get("id")
-                        ).first()
-                        
-                        # Map to case
-                        case_data = self._map_mynaga_to_case(report)
-                        
-                        if existing_case:
-                            # Update existing case
-                            for key, value in case_data.dict().items():
-                                if value is not None:
-                                    setattr(existing_case, key, value)
-                            existing_case.updated_at = datetime.utcnow()
-                            stats["updated"] += 1
-                        else:
-                            # Create new case
-                            new_case = Case(**case_data.dict())
-                            self.db.add(new_case)
-                            stats["created"] += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing report {report.get('id')}: {e}")
-                        stats["errors"] += 1
-                        stats["error_messages"].append(str(e))
+                # Fetch overlaps storing, so fetch_ms is the phase's wall time
+                stats["timings"]["fetch_ms"] = int((time.perf_counter() - started) * 1000)
+                stats["timings"]["store_ms"] = int(store_seconds * 1000)
                 
-                # Commit all changes
-                self.db.commit()
-                logger.info(f"Sync complete: {stats['created']} created, {stats['updated']} updated")
+                # Only reached when every window was fetched
+                await asyncio.to_thread(self._save_watermark, last_seen_at, full, sync_started_at)
+                logger.info(
+                    f"Sync complete: {stats['created']} created, {stats['updated']} updated, "
+                    f"{stats['unchanged']} unchanged"
+                )
                 
         except Exception as e:
             logger.error(f"Sync failed: {e}")
@@ -253,16 +476,17 @@ class MyNagaSyncService:
         return stats
 
 
-async def sync_mynaga_data(auth_token: str, db: Session) -> Dict:
+async def sync_mynaga_data(auth_token: str, db: Session, full: bool = False) -> Dict:
     """
     Perform MyNaga data sync.
     
     Args:
         auth_token: MyNaga authentication token
         db: Database session
+        full: Re-fetch the whole month regardless of the watermark
         
     Returns:
         Sync statistics
     """
     service = MyNagaSyncService(auth_token, db)
-    return await service.sync_reports()
+    return await service.sync_reports(full)
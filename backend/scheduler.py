@@ -1,14 +1,21 @@
 """Background task scheduler for real-time MyNaga and Google Sheets data sync."""
-import asyncio
 import logging
 from datetime import datetime, timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
+from config import settings
 from database import SessionLocal
 from mynaga_sync import sync_mynaga_data
 from google_sheets_sync import GoogleSheetsSync
-from typing import Optional
+from sheets_outbox import drain_outbox, get_outbox_status
+from sync_runtime import sync_runtime
+from sync_lease import get_lease_status, release_lease, try_acquire_lease
+from sync_history import (
+    JOB_GOOGLE_SHEETS, JOB_MYNAGA, disable_job_config, finish_sync_run,
+    load_enabled_job_configs, load_job_config, save_job_config, start_sync_run
+)
+from typing import Any, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +23,62 @@ logger = logging.getLogger(__name__)
 scheduler: BackgroundScheduler = None
 sync_task_id = "mynaga_sync_task"
 sheets_sync_task_id = "google_sheets_sync_task"
+sheets_outbox_task_id = "google_sheets_outbox_task"
+lease_task_id = "sync_lease_task"
+
+# How often queued case edits are written back to Google Sheets
+OUTBOX_DRAIN_INTERVAL_SECONDS = 2
+
+
+class AdaptiveInterval:
+    """Sync interval that tightens while data is changing and backs off while idle."""
+    
+    def __init__(self, base_seconds: int, min_seconds: int, max_seconds: int):
+        """
+        Initialize the interval at the configured base.
+        
+        Args:
+            base_seconds: Configured interval, where adaptation starts
+            min_seconds: Shortest interval (widened to include the base)
+            max_seconds: Longest interval (widened to include the base)
+        """
+        self.base_seconds = base_seconds
+        self.min_seconds = min(min_seconds, base_seconds)
+        self.max_seconds = max(max_seconds, base_seconds)
+        self.current_seconds = base_seconds
+    
+    def record(self, changed: bool) -> int:
+        """
+        Adapt to the outcome of a sync.
+        
+        Args:
+            changed: Whether the sync created or updated any cases
+            
+        Returns:
+            The new effective interval in seconds
+        """
+        if changed:
+            self.current_seconds = max(self.current_seconds // 2, self.min_seconds)
+        else:
+            self.current_seconds = min(self.current_seconds * 2, self.max_seconds)
+        return self.current_seconds
+
+
+def _found_changes(stats: Optional[dict]) -> bool:
+    """Whether a sync's statistics report created or updated cases."""
+    return bool(stats) and bool(stats.get('created') or stats.get('updated'))
+
+
+def _adapt_interval(job_id: str, interval: Optional[AdaptiveInterval], stats: Optional[dict]):
+    """Feed a sync outcome to its adaptive interval and reschedule the job if it moved."""
+    if interval is None or scheduler is None:
+        return
+    
+    previous = interval.current_seconds
+    current = interval.record(_found_changes(stats))
+    if current != previous:
+        scheduler.reschedule_job(job_id, trigger=IntervalTrigger(seconds=current))
+        logger.info(f"{job_id} interval adjusted: {previous}s -> {current}s")
 
 
 class SyncManager:
@@ -31,20 +94,79 @@ class SyncManager:
         self.sheets_last_sync_time: datetime = None
         self.sheets_last_sync_status: dict = None
         self.sheets_is_syncing = False
-        self.sheets_config: Optional[dict] = None
+        
+        # (config, interval_seconds) of the jobs scheduled in this process,
+        # kept in step with sync_job_configs by reconcile_sync_jobs()
+        self.job_configs: Dict[str, Tuple[Dict[str, Any], int]] = {}
+        
+        # Effective intervals of the scheduled syncs (None when not scheduled)
+        self.mynaga_interval: Optional[AdaptiveInterval] = None
+        self.sheets_interval: Optional[AdaptiveInterval] = None
+        
+        # Whether this process holds the sync leader lease
+        self.is_leader = False
+    
+    @property
+    def sheets_config(self) -> Optional[dict]:
+        """
+        Saved Google Sheets job configuration.
+        
+        Read from sync_job_configs rather than process memory, so every
+        worker sees the configuration whichever worker received it.
+        """
+        job = load_job_config(JOB_GOOGLE_SHEETS)
+        return job[0] if job else None
+    
+    def hold_leadership(self) -> bool:
+        """
+        Take or renew the sync leader lease.
+        
+        Scheduled jobs only run in the leader process, so several API
+        workers don't repeat the same syncs.
+        
+        Returns:
+            True if this process is the sync leader
+        """
+        db: Session = SessionLocal()
+        try:
+            is_leader = try_acquire_lease(db, settings.sync_lease_seconds)
+        except Exception as e:
+            logger.error(f"Sync lease check failed: {e}")
+            db.rollback()
+            is_leader = False
+        finally:
+            db.close()
+        
+        if is_leader != self.is_leader:
+            logger.info("This worker is now the sync leader" if is_leader else "This worker is no longer the sync leader")
+        self.is_leader = is_leader
+        return is_leader
     
-    async def run_sync(self, auth_token: str):
+    def release_leadership(self):
+        """Hand the sync leader lease back so another worker takes over right away."""
+        db: Session = SessionLocal()
+        try:
+            release_lease(db)
+        except Exception as e:
+            logger.error(f"Failed to release sync lease: {e}")
+        finally:
+            db.close()
+        self.is_leader = False
+    
+    async def run_sync(self, auth_token: str, trigger: str = "scheduled"):
         """
         Run the sync task.
         
         Args:
             auth_token: MyNaga authentication token
+            trigger: "scheduled" or "manual", recorded in the run history
         """
         if self.is_syncing:
             logger.warning("Sync already in progress, skipping...")
             return
         
         self.is_syncing = True
+        run_id = start_sync_run(JOB_MYNAGA, trigger)
         try:
             logger.info("Starting MyNaga sync task...")
             db: Session = SessionLocal()
@@ -53,76 +175,125 @@ class SyncManager:
             
             self.last_sync_time = datetime.utcnow()
             self.last_sync_status = stats
+            finish_sync_run(run_id, stats)
             
             logger.info(f"Sync completed: {stats}")
             
         except Exception as e:
             logger.error(f"Sync task failed: {e}")
             self.last_sync_status = {"error": str(e)}
+            finish_sync_run(run_id, error=str(e))
         
         finally:
             self.is_syncing = False
             if 'db' in locals():
                 db.close()
     
-    async def run_google_sheets_sync(self):
-        """Run Google Sheets sync task."""
+    async def run_google_sheets_sync(self, trigger: str = "scheduled"):
+        """
+        Run Google Sheets sync task.
+        
+        Args:
+            trigger: "scheduled" or "manual", recorded in the run history
+        """
         if self.sheets_is_syncing:
             logger.warning("Google Sheets sync already in progress, skipping...")
             return
         
-        if not self.sheets_config:
+        config = self.sheets_config
+        if not config:
             logger.warning("No Google Sheets configuration set, skipping sync")
             return
         
         self.sheets_is_syncing = True
+        run_id = start_sync_run(JOB_GOOGLE_SHEETS, trigger)
         try:
             logger.info("Starting Google Sheets sync task...")
             db: Session = SessionLocal()
             
             sheets_sync = GoogleSheetsSync(
-                sheet_url=self.sheets_config.get('sheet_url'),
+                sheet_url=config.get('sheet_url'),
                 db=db,
-                credentials_json=self.sheets_config.get('credentials_json')
+                credentials_json=config.get('credentials_json')
             )
             
             stats = await sheets_sync.sync_to_database()
             
             self.sheets_last_sync_time = datetime.utcnow()
             self.sheets_last_sync_status = stats
+            finish_sync_run(run_id, stats)
             
             logger.info(f"Google Sheets sync completed: {stats}")
             
         except Exception as e:
             logger.error(f"Google Sheets sync task failed: {e}")
             self.sheets_last_sync_status = {"error": str(e)}
+            finish_sync_run(run_id, error=str(e))
         
         finally:
             self.sheets_is_syncing = False
             if 'db' in locals():
                 db.close()
     
-    def set_sheets_config(self, sheet_url: str, credentials_json: Optional[str] = None):
-        """Set Google Sheets configuration for automatic sync."""
-        self.sheets_config = {
-            'sheet_url': sheet_url,
-            'credentials_json': credentials_json
-        }
-        logger.info(f"Google Sheets config updated: sheet_url={sheet_url}")
+    def drain_sheets_outbox(self):
+        """Write queued case edits back to Google Sheets."""
+        if not self.hold_leadership():
+            return
+        config = self.sheets_config
+        if not config or not config.get('credentials_json'):
+            return
+        
+        db: Session = SessionLocal()
+        try:
+            # Keep flushing while batches come back full
+            while True:
+                stats = drain_outbox(
+                    db,
+                    sheet_url=config.get('sheet_url'),
+                    credentials_json=config.get('credentials_json')
+                )
+                if stats['sent'] or stats['failed']:
+                    logger.info(f"Google Sheets write-back: {stats}")
+                if stats['sent'] + stats['failed'] < settings.sheets_writeback_batch_size:
+                    break
+        except Exception as e:
+            logger.error(f"Google Sheets write-back failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+    
+    def writes_back_to_sheet(self) -> bool:
+        """Whether case edits are written back (needs service account credentials)."""
+        config = self.sheets_config
+        return bool(config and config.get('credentials_json'))
     
     def get_sync_status(self) -> dict:
         """Get current sync status."""
+        db: Session = SessionLocal()
+        try:
+            outbox = get_outbox_status(db)
+            leader = get_lease_status(db)
+        finally:
+            db.close()
+        
         return {
             "mynaga": {
                 "last_sync_time": self.last_sync_time,
                 "last_sync_status": self.last_sync_status,
-                "is_syncing": self.is_syncing
+                "is_syncing": self.is_syncing,
+                "interval_seconds": self.mynaga_interval.base_seconds if self.mynaga_interval else None,
+                "effective_interval_seconds": self.mynaga_interval.current_seconds if self.mynaga_interval else None,
+                "leader": leader
             },
             "google_sheets": {
                 "last_sync_time": self.sheets_last_sync_time,
                 "last_sync_status": self.sheets_last_sync_status,
                 "is_syncing": self.sheets_is_syncing,
-                "configured": self.sheets_config is not None
+                "configured": self.sheets_config is not None,
+                "interval_seconds": self.sheets_interval.base_seconds if self.sheets_interval else None,
+                "effective_interval_seconds": self.sheets_interval.current_seconds if self.sheets_interval else None,
+                "write_back_queue": outbox,
+                "leader": leader
             }
         }
 
@@ -131,58 +302,194 @@ class SyncManager:
 sync_manager = SyncManager()
 
 
-def init_scheduler(auth_token: str, sync_interval_minutes: int = 5):
-    """
-    Initialize background scheduler for MyNaga sync.
-    
-    Args:
-        auth_token: MyNaga authentication token
-        sync_interval_minutes: Interval between syncs in minutes
-    """
+def _ensure_scheduler() -> BackgroundScheduler:
+    """Start the background scheduler and its sync lease heartbeat if needed."""
     global scheduler
     
-    try:
-        if scheduler is None:
-            scheduler = BackgroundScheduler()
-            scheduler.start()
-            logger.info("Scheduler started")
-        
-        # Add sync job
-        def sync_job():
-            """Wrapper for sync task."""
-            asyncio.run(sync_manager.run_sync(auth_token))
-        
-        # Remove existing job if present
-        try:
-            scheduler.remove_job(sync_task_id)
-        except:
-            pass
-        
-        # Add new job
+    if scheduler is None:
+        scheduler = BackgroundScheduler()
+        scheduler.start()
+        logger.info("Scheduler started")
+    
+    # Renew the lease while leading, or take over once the leader's lapses
+    scheduler.add_job(
+        sync_heartbeat,
+        IntervalTrigger(seconds=max(settings.sync_lease_seconds // 3, 1)),
+        id=lease_task_id,
+        name="Sync Leader Lease",
+        replace_existing=True
+    )
+    return scheduler
+
+
+def _mynaga_job():
+    """Scheduled MyNaga sync."""
+    if not sync_manager.hold_leadership():
+        logger.debug("Not the sync leader, skipping MyNaga sync")
+        return
+    job = sync_manager.job_configs.get(JOB_MYNAGA)
+    if job is None:
+        return
+    # Runs on the persistent sync loop, reusing its HTTP connections
+    sync_runtime.run(sync_manager.run_sync(job[0].get('auth_token')))
+    _adapt_interval(sync_task_id, sync_manager.mynaga_interval, sync_manager.last_sync_status)
+
+
+def _google_sheets_job():
+    """Scheduled Google Sheets sync."""
+    if not sync_manager.hold_leadership():
+        logger.debug("Not the sync leader, skipping Google Sheets sync")
+        return
+    # Runs on the persistent sync loop, reusing its HTTP connections
+    sync_runtime.run(sync_manager.run_google_sheets_sync())
+    _adapt_interval(sheets_sync_task_id, sync_manager.sheets_interval, sync_manager.sheets_last_sync_status)
+
+
+def _schedule_job(name: str, config: Dict[str, Any], interval_seconds: int):
+    """Add or replace a sync job in this process's scheduler."""
+    previous = sync_manager.job_configs.get(name)
+    sync_manager.job_configs[name] = (config, interval_seconds)
+    
+    if name == JOB_MYNAGA:
+        sync_manager.mynaga_interval = AdaptiveInterval(
+            interval_seconds,
+            settings.mynaga_sync_min_seconds,
+            settings.mynaga_sync_max_seconds
+        )
         scheduler.add_job(
-            sync_job,
-            IntervalTrigger(minutes=sync_interval_minutes),
+            _mynaga_job,
+            IntervalTrigger(seconds=interval_seconds),
             id=sync_task_id,
             name="MyNaga Data Sync",
             replace_existing=True
         )
+        logger.info(f"MyNaga sync scheduled: Every {interval_seconds} seconds")
+    
+    elif name == JOB_GOOGLE_SHEETS:
+        previous_credentials = previous[0].get('credentials_json') if previous else None
+        if previous_credentials and previous_credentials != config.get('credentials_json'):
+            # Drop the cached API client for the replaced service account
+            from google_sheets_auth import invalidate_sheets_clients
+            invalidate_sheets_clients(previous_credentials)
         
-        logger.info(
-            f"MyNaga sync scheduled: Every {sync_interval_minutes} minutes"
+        sync_manager.sheets_interval = AdaptiveInterval(
+            interval_seconds,
+            settings.sheets_sync_min_seconds,
+            settings.sheets_sync_max_seconds
+        )
+        scheduler.add_job(
+            _google_sheets_job,
+            IntervalTrigger(seconds=interval_seconds),
+            id=sheets_sync_task_id,
+            name="Google Sheets Data Sync",
+            replace_existing=True
         )
+        # Background worker for queued write-backs
+        scheduler.add_job(
+            sync_manager.drain_sheets_outbox,
+            IntervalTrigger(seconds=OUTBOX_DRAIN_INTERVAL_SECONDS),
+            id=sheets_outbox_task_id,
+            name="Google Sheets Write-back",
+            replace_existing=True
+        )
+        logger.info(f"Google Sheets sync scheduled: Every {interval_seconds} seconds")
+
+
+def _unschedule_job(name: str):
+    """Remove a sync job from this process's scheduler."""
+    sync_manager.job_configs.pop(name, None)
+    
+    if name == JOB_MYNAGA:
+        job_ids = [sync_task_id]
+        sync_manager.mynaga_interval = None
+    else:
+        job_ids = [sheets_sync_task_id, sheets_outbox_task_id]
+        sync_manager.sheets_interval = None
+    
+    for job_id in job_ids:
+        if scheduler and scheduler.get_job(job_id):
+            scheduler.remove_job(job_id)
+    logger.info(f"{name} sync unscheduled in this worker")
+
+
+def reconcile_sync_jobs():
+    """
+    Make this process's scheduled jobs match sync_job_configs.
+    
+    Start, stop and reconfigure requests may land on any worker; they only
+    write sync_job_configs, and the leader picks the change up here.
+    """
+    wanted = {name: (config, interval) for name, config, interval in load_enabled_job_configs()}
+    
+    for name in list(sync_manager.job_configs):
+        if name not in wanted:
+            _unschedule_job(name)
+    
+    for name, (config, interval_seconds) in wanted.items():
+        if sync_manager.job_configs.get(name) != (config, interval_seconds):
+            _schedule_job(name, config, interval_seconds)
+
+
+def sync_heartbeat():
+    """
+    Renew or take the sync leader lease and follow the saved job configs.
+    
+    The leader schedules the enabled jobs; other workers schedule none.
+    """
+    try:
+        if sync_manager.hold_leadership():
+            reconcile_sync_jobs()
+        else:
+            for name in list(sync_manager.job_configs):
+                _unschedule_job(name)
+    except Exception as e:
+        logger.error(f"Sync heartbeat failed: {e}")
+
+
+def init_scheduler(auth_token: str, sync_interval_minutes: int = 5):
+    """
+    Initialize background scheduler for MyNaga sync.
+    
+    The job is saved to sync_job_configs and run by whichever worker holds
+    the sync lease (within one heartbeat if that is another worker).
+    
+    Args:
+        auth_token: MyNaga authentication token
+        sync_interval_minutes: Interval between syncs in minutes
+    """
+    try:
+        save_job_config(JOB_MYNAGA, {'auth_token': auth_token}, sync_interval_minutes * 60)
+        _ensure_scheduler()
+        sync_heartbeat()
         
     except Exception as e:
         logger.error(f"Failed to initialize scheduler: {e}")
 
 
+def stop_mynaga_scheduler():
+    """Stop MyNaga automatic sync (in every worker, via sync_job_configs)."""
+    disable_job_config(JOB_MYNAGA)
+    if JOB_MYNAGA in sync_manager.job_configs:
+        _unschedule_job(JOB_MYNAGA)
+
+
 def stop_scheduler():
-    """Stop the background scheduler."""
+    """Stop the background scheduler (on shutdown)."""
     global scheduler
     
     if scheduler and scheduler.running:
         scheduler.shutdown()
         scheduler = None
         logger.info("Scheduler stopped")
+    
+    sync_manager.job_configs.clear()
+    sync_manager.mynaga_interval = None
+    sync_manager.sheets_interval = None
+    
+    sync_runtime.stop()
+    
+    if sync_manager.is_leader:
+        sync_manager.release_leadership()
 
 
 async def trigger_manual_sync(auth_token: str):
@@ -195,53 +502,34 @@ async def trigger_manual_sync(auth_token: str):
     Returns:
         Sync statistics
     """
-    await sync_manager.run_sync(auth_token)
+    await sync_manager.run_sync(auth_token, trigger="manual")
     return sync_manager.last_sync_status
 
 
-def init_google_sheets_scheduler(sheet_url: str, credentials_json: Optional[str] = None, sync_interval_seconds: int = 10):
+def init_google_sheets_scheduler(
+    sheet_url: str,
+    credentials_json: Optional[str] = None,
+    sync_interval_seconds: int = 10
+):
     """
     Initialize background scheduler for Google Sheets sync.
     
+    The job is saved to sync_job_configs and run by whichever worker holds
+    the sync lease (within one heartbeat if that is another worker).
+    
     Args:
         sheet_url: Google Sheets URL (full URL with gid)
         credentials_json: Optional service account credentials JSON
         sync_interval_seconds: Interval between syncs in seconds (default: 10)
     """
-    global scheduler
-    
     try:
-        # Set configuration
-        sync_manager.set_sheets_config(sheet_url, credentials_json)
-        
-        if scheduler is None:
-            scheduler = BackgroundScheduler()
-            scheduler.start()
-            logger.info("Scheduler started")
-        
-        # Add sync job
-        def sync_job():
-            """Wrapper for Google Sheets sync task."""
-            asyncio.run(sync_manager.run_google_sheets_sync())
-        
-        # Remove existing job if present
-        try:
-            scheduler.remove_job(sheets_sync_task_id)
-        except:
-            pass
-        
-        # Add new job
-        scheduler.add_job(
-            sync_job,
-            IntervalTrigger(seconds=sync_interval_seconds),
-            id=sheets_sync_task_id,
-            name="Google Sheets Data Sync",
-            replace_existing=True
-        )
-        
-        logger.info(
-            f"Google Sheets sync scheduled: Every {sync_interval_seconds} seconds"
+        save_job_config(
+            JOB_GOOGLE_SHEETS,
+            {'sheet_url': sheet_url, 'credentials_json': credentials_json},
+            sync_interval_seconds
         )
+        _ensure_scheduler()
+        sync_heartbeat()
         
         return {"message": f"Auto-sync enabled: every {sync_interval_seconds} seconds"}
         
@@ -251,18 +539,15 @@ def init_google_sheets_scheduler(sheet_url: str, credentials_json: Optional[str]
 
 
 def stop_google_sheets_scheduler():
-    """Stop Google Sheets automatic sync."""
-    global scheduler
+    """Stop Google Sheets automatic sync (in every worker, via sync_job_configs)."""
+    if load_job_config(JOB_GOOGLE_SHEETS) is None:
+        return {"message": "No active sync to stop"}
     
-    if scheduler:
-        try:
-            scheduler.remove_job(sheets_sync_task_id)
-            logger.info("Google Sheets sync stopped")
-            return {"message": "Auto-sync stopped"}
-        except:
-            pass
-    
-    return {"message": "No active sync to stop"}
+    disable_job_config(JOB_GOOGLE_SHEETS)
+    if JOB_GOOGLE_SHEETS in sync_manager.job_configs:
+        _unschedule_job(JOB_GOOGLE_SHEETS)
+    logger.info("Google Sheets sync stopped")
+    return {"message": "Auto-sync stopped"}
 
 
 async def trigger_manual_sheets_sync():
@@ -272,5 +557,11 @@ async def trigger_manual_sheets_sync():
     Returns:
         Sync statistics
     """
-    await sync_manager.run_google_sheets_sync()
+    await sync_manager.run_google_sheets_sync(trigger="manual")
     return sync_manager.sheets_last_sync_status
+
+
+def resume_sync_jobs():
+    """Start the lease heartbeat so the leader runs the jobs saved in sync_job_configs."""
+    _ensure_scheduler()
+    sync_heartbeat()
@@ -1,7 +1,7 @@
 """Pydantic schemas for request/response validation."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, Json
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class TagCreate(BaseModel):
@@ -84,6 +84,7 @@ class CaseResponse(BaseModel):
     attached_media: Optional[str]  # Media URLs from MyNaga App
     office: Optional[str]  # Column I
     link_to_report: Optional[str]
+    mynaga_id: Optional[str] = None  # MyNaga report _id
     mynaga_app_status: Optional[str]  # Column M
     updates_sent_to_user_new: Optional[str]  # Column N (TEXT field)
     status: str
@@ -157,3 +158,41 @@ class StatsResponse(BaseModel):
     total_offices: int
     total_clusters: int
     average_case_aging: float
+
+
+class CaseTombstone(BaseModel):
+    """Schema for a deleted case in the change feed."""
+    id: int
+    control_no: Optional[str] = None
+    seq: int
+
+
+class CaseChangesResponse(BaseModel):
+    """Schema for the case change feed."""
+    changes: List[CaseResponse] = []
+    deleted: List[CaseTombstone] = []
+    next_since: int  # Pass as `since` on the next call
+    has_more: bool = False
+    reset: bool = False  # `since` is older than the retained feed; reload everything
+
+
+class SyncRunResponse(BaseModel):
+    """Schema for a sync run history entry."""
+    id: int
+    job: str
+    trigger: Optional[str] = None
+    worker: Optional[str] = None
+    status: Optional[str] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_ms: Optional[int] = None
+    phase_timings: Optional[Json[Dict[str, int]]] = None
+    rows_fetched: Optional[int] = None
+    rows_created: Optional[int] = None
+    rows_updated: Optional[int] = None
+    rows_unchanged: Optional[int] = None
+    rows_skipped: Optional[int] = None
+    errors: Optional[Json[List[str]]] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,201 @@
+"""Durable outbox for writing case edits back to Google Sheets."""
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config import settings
+from models import Case, SheetWriteOutbox
+
+logger = logging.getLogger(__name__)
+
+# Retry schedule for failed write-backs: base * 2^attempts, capped
+OUTBOX_RETRY_BASE_SECONDS = 5
+OUTBOX_RETRY_MAX_SECONDS = 600
+# Entries that fail this many times are kept but no longer retried
+OUTBOX_MAX_ATTEMPTS = 20
+
+
+def case_to_sheet_data(case: Case, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Build the write_cases_to_sheet payload for a case.
+
+    Args:
+        case: Case model instance
+        fields: Case fields to include (default: every sheet-owned field)
+
+    Returns:
+        Case data dictionary with control_no and the requested sheet fields
+    """
+    from google_sheets_sync import SHEET_WRITE_FIELDS
+
+    wanted = SHEET_WRITE_FIELDS if fields is None else [f for f in SHEET_WRITE_FIELDS if f in fields]
+    data = {'control_no': case.control_no}
+    for field in wanted:
+        data[field] = getattr(case, field) or ''
+    return data
+
+
+def enqueue_case_write(
+    db: Session,
+    case: Case,
+    fields: Optional[Iterable[str]] = None
+) -> Optional[SheetWriteOutbox]:
+    """
+    Queue the changed sheet fields of a case for write-back in the caller's transaction.
+
+    A case that already has a pending entry keeps that entry (and its
+    place in the queue), merged with the latest values, so bursts of edits
+    to one case become a single write. New entries wait for the flush window.
+
+    Args:
+        db: Database session (caller commits together with the case change)
+        case: Case to write back
+        fields: Case fields that changed (default: every sheet-owned field)
+
+    Returns:
+        The pending outbox entry, or None if no sheet field changed
+    """
+    data = case_to_sheet_data(case, fields)
+    if len(data) == 1:
+        return None
+
+    entry = db.query(SheetWriteOutbox).filter(
+        SheetWriteOutbox.control_no == case.control_no,
+        SheetWriteOutbox.attempts < OUTBOX_MAX_ATTEMPTS
+    ).order_by(SheetWriteOutbox.id).first()
+
+    if entry:
+        entry.payload = json.dumps({**json.loads(entry.payload), **data})
+    else:
+        entry = SheetWriteOutbox(
+            control_no=case.control_no,
+            payload=json.dumps(data),
+            next_attempt_at=datetime.utcnow() + timedelta(seconds=settings.sheets_writeback_flush_seconds),
+        )
+        db.add(entry)
+    return entry
+
+
+def pending_write_control_nos(db: Session) -> Set[str]:
+    """
+    Control numbers with case edits still waiting to be written to the sheet.
+
+    Their sheet rows are stale until the write-back lands, so sheet syncs
+    must not apply them over the edit. Entries that gave up retrying no
+    longer hold the row back.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Set of control numbers
+    """
+    return {
+        control_no for (control_no,) in db.query(SheetWriteOutbox.control_no).filter(
+            SheetWriteOutbox.attempts < OUTBOX_MAX_ATTEMPTS
+        ).distinct()
+    }
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt after `attempts` failures."""
+    return timedelta(seconds=min(OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), OUTBOX_RETRY_MAX_SECONDS))
+
+
+def drain_outbox(
+    db: Session,
+    sheet_url: str,
+    credentials_json: str,
+    batch_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Write due outbox entries to Google Sheets in one batchUpdate call.
+
+    Entries are taken oldest first and coalesced per control number.
+    Written entries are deleted unless they were re-queued with newer data
+    meanwhile; failed ones are rescheduled with exponential backoff.
+
+    Args:
+        db: Database session
+        sheet_url: Google Sheets URL
+        credentials_json: Service account credentials JSON string
+        batch_size: Maximum entries per call (default: settings.sheets_writeback_batch_size)
+
+    Returns:
+        Dictionary with sent and failed counts
+    """
+    from google_sheets_sync import write_cases_to_sheet
+
+    stats = {'sent': 0, 'failed': 0}
+
+    entries = db.query(
+        SheetWriteOutbox.id,
+        SheetWriteOutbox.control_no,
+        SheetWriteOutbox.payload,
+        SheetWriteOutbox.attempts
+    ).filter(
+        SheetWriteOutbox.next_attempt_at <= datetime.utcnow(),
+        SheetWriteOutbox.attempts < OUTBOX_MAX_ATTEMPTS
+    ).order_by(SheetWriteOutbox.id).limit(batch_size or settings.sheets_writeback_batch_size).all()
+
+    # Release the read transaction before talking to Google
+    db.commit()
+    if not entries:
+        return stats
+
+    # Merged changes per control number, later entries winning
+    latest = {}
+    for entry in entries:
+        latest.setdefault(entry.control_no, {}).update(json.loads(entry.payload))
+
+    results = write_cases_to_sheet(list(latest.values()), sheet_url, credentials_json)
+
+    for entry in entries:
+        error = results.get(entry.control_no, "Write to Google Sheets failed")
+        if error is None:
+            # Payload check keeps edits queued while this batch was in flight
+            db.query(SheetWriteOutbox).filter(
+                SheetWriteOutbox.id == entry.id,
+                SheetWriteOutbox.payload == entry.payload
+            ).delete(synchronize_session=False)
+            stats['sent'] += 1
+        else:
+            attempts = entry.attempts + 1
+            db.query(SheetWriteOutbox).filter(SheetWriteOutbox.id == entry.id).update({
+                SheetWriteOutbox.attempts: attempts,
+                SheetWriteOutbox.last_error: error,
+                SheetWriteOutbox.next_attempt_at: datetime.utcnow() + _retry_delay(attempts),
+            }, synchronize_session=False)
+            stats['failed'] += 1
+            logger.warning(f"Write-back of {entry.control_no} failed (attempt {attempts}): {error}")
+
+    db.commit()
+    return stats
+
+
+def get_outbox_status(db: Session) -> Dict[str, Optional[float]]:
+    """
+    Summarize the outbox for the sync status endpoint.
+
+    Returns:
+        Dictionary with queue depth, lag of the oldest pending entry in
+        seconds, and the number of entries that gave up retrying
+    """
+    depth, oldest = db.query(
+        func.count(SheetWriteOutbox.id),
+        func.min(SheetWriteOutbox.created_at)
+    ).filter(SheetWriteOutbox.attempts < OUTBOX_MAX_ATTEMPTS).one()
+
+    failed = db.query(func.count(SheetWriteOutbox.id)).filter(
+        SheetWriteOutbox.attempts >= OUTBOX_MAX_ATTEMPTS
+    ).scalar()
+
+    return {
+        'depth': depth,
+        'lag_seconds': (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0,
+        'failed': failed,
+    }
@@ -0,0 +1,171 @@
+"""Persisted sync job configuration and run history."""
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import SyncJobConfig, SyncRun
+from sync_lease import WORKER_ID
+
+logger = logging.getLogger(__name__)
+
+# Sync job names used for configs and runs
+JOB_GOOGLE_SHEETS = "google_sheets"
+JOB_MYNAGA = "mynaga"
+
+
+def save_job_config(name: str, config: Dict[str, Any], interval_seconds: int, enabled: bool = True):
+    """
+    Store a sync job's configuration so it survives restarts.
+
+    Args:
+        name: Job name (JOB_GOOGLE_SHEETS or JOB_MYNAGA)
+        config: JSON-serializable job arguments
+        interval_seconds: Sync interval
+        enabled: Whether the job is resumed on startup
+    """
+    db: Session = SessionLocal()
+    try:
+        job = db.get(SyncJobConfig, name)
+        if job is None:
+            job = SyncJobConfig(name=name)
+            db.add(job)
+        job.config = json.dumps(config)
+        job.interval_seconds = interval_seconds
+        job.enabled = enabled
+        db.commit()
+    finally:
+        db.close()
+
+
+def disable_job_config(name: str):
+    """
+    Keep a job's configuration but stop resuming it on startup.
+
+    Args:
+        name: Job name
+    """
+    db: Session = SessionLocal()
+    try:
+        db.query(SyncJobConfig).filter(SyncJobConfig.name == name).update(
+            {SyncJobConfig.enabled: False}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def load_enabled_job_configs() -> List[Tuple[str, Dict[str, Any], int]]:
+    """
+    Load the sync jobs to resume.
+
+    Returns:
+        List of (name, config, interval_seconds)
+    """
+    db: Session = SessionLocal()
+    try:
+        jobs = db.query(SyncJobConfig).filter(SyncJobConfig.enabled == True).all()
+        return [(job.name, json.loads(job.config or "{}"), job.interval_seconds) for job in jobs]
+    finally:
+        db.close()
+
+
+def load_job_config(name: str) -> Optional[Tuple[Dict[str, Any], int]]:
+    """
+    Load one enabled sync job's configuration.
+    
+    Args:
+        name: Job name
+    
+    Returns:
+        (config, interval_seconds), or None if the job is missing or disabled
+    """
+    db: Session = SessionLocal()
+    try:
+        job = db.get(SyncJobConfig, name)
+        if job is None or not job.enabled:
+            return None
+        return json.loads(job.config or "{}"), job.interval_seconds
+    finally:
+        db.close()
+
+
+def start_sync_run(job: str, trigger: str) -> Optional[int]:
+    """
+    Record the start of a sync run.
+
+    Args:
+        job: Job name
+        trigger: "scheduled" or "manual"
+
+    Returns:
+        The run ID, or None if it could not be recorded
+    """
+    db: Session = SessionLocal()
+    try:
+        run = SyncRun(job=job, trigger=trigger, worker=WORKER_ID, status="running", started_at=datetime.utcnow())
+        db.add(run)
+        db.commit()
+        return run.id
+    except Exception as e:
+        # History must never break the sync itself
+        logger.error(f"Failed to record {job} sync run: {e}")
+        db.rollback()
+        return None
+    finally:
+        db.close()
+
+
+def finish_sync_run(run_id: Optional[int], stats: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+    """
+    Record the outcome of a sync run.
+
+    Understands both the Google Sheets and the MyNaga stats dictionaries.
+
+    Args:
+        run_id: ID returned by start_sync_run
+        stats: Sync statistics (None if the sync raised)
+        error: Error that aborted the sync
+    """
+    if run_id is None:
+        return
+
+    stats = stats or {}
+    errors = stats.get("errors")
+    errors = list(errors if isinstance(errors, list) else stats.get("error_messages") or [])
+    if error:
+        errors.append(error)
+
+    if error:
+        status = "failed"
+    elif stats.get("not_modified"):
+        status = "not_modified"
+    elif errors:
+        status = "partial"
+    else:
+        status = "success"
+
+    db: Session = SessionLocal()
+    try:
+        run = db.get(SyncRun, run_id)
+        if run is None:
+            return
+        run.finished_at = datetime.utcnow()
+        run.duration_ms = int((run.finished_at - run.started_at).total_seconds() * 1000)
+        run.status = status
+        run.phase_timings = json.dumps(stats["timings"]) if stats.get("timings") else None
+        run.rows_fetched = stats.get("fetched", stats.get("total_fetched"))
+        run.rows_created = stats.get("created")
+        run.rows_updated = stats.get("updated")
+        run.rows_unchanged = stats.get("unchanged")
+        run.rows_skipped = stats.get("skipped")
+        run.errors = json.dumps(errors) if errors else None
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to record sync run {run_id} result: {e}")
+        db.rollback()
+    finally:
+        db.close()
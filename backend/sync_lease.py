@@ -0,0 +1,108 @@
+"""Database lease electing a single background sync leader across processes."""
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import SyncLease
+
+logger = logging.getLogger(__name__)
+
+# Lease shared by all scheduled sync jobs
+SYNC_LEADER_LEASE = "sync-leader"
+
+# Identifies this worker process in the lease table and sync status
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def try_acquire_lease(db: Session, ttl_seconds: int, name: str = SYNC_LEADER_LEASE) -> bool:
+    """
+    Take or renew a lease for this process.
+
+    The lease is granted when this process already holds it or the
+    previous holder let it expire (e.g. the worker died). Acquisition is a
+    single conditional UPDATE, so only one process can win a race.
+
+    Args:
+        db: Database session (committed here)
+        ttl_seconds: Lease duration from now
+        name: Lease name
+
+    Returns:
+        True if this process holds the lease
+    """
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+
+    try:
+        renewed = db.query(SyncLease).filter(
+            SyncLease.name == name,
+            SyncLease.holder == WORKER_ID
+        ).update({SyncLease.expires_at: expires_at}, synchronize_session=False)
+
+        if not renewed:
+            renewed = db.query(SyncLease).filter(
+                SyncLease.name == name,
+                or_(SyncLease.expires_at == None, SyncLease.expires_at < now)
+            ).update({
+                SyncLease.holder: WORKER_ID,
+                SyncLease.acquired_at: now,
+                SyncLease.expires_at: expires_at,
+            }, synchronize_session=False)
+            if renewed:
+                logger.info(f"Acquired {name} lease as {WORKER_ID}")
+
+        if not renewed and db.get(SyncLease, name) is None:
+            db.add(SyncLease(name=name, holder=WORKER_ID, acquired_at=now, expires_at=expires_at))
+            db.flush()
+            renewed = 1
+            logger.info(f"Acquired {name} lease as {WORKER_ID}")
+
+        db.commit()
+        return bool(renewed)
+
+    except IntegrityError:
+        # Another process created the lease row first
+        db.rollback()
+        return False
+
+
+def release_lease(db: Session, name: str = SYNC_LEADER_LEASE):
+    """
+    Give up a lease held by this process so another worker can take over at once.
+
+    Args:
+        db: Database session (committed here)
+        name: Lease name
+    """
+    released = db.query(SyncLease).filter(
+        SyncLease.name == name,
+        SyncLease.holder == WORKER_ID
+    ).update({SyncLease.expires_at: None}, synchronize_session=False)
+    db.commit()
+    if released:
+        logger.info(f"Released {name} lease")
+
+
+def get_lease_status(db: Session, name: str = SYNC_LEADER_LEASE) -> Dict[str, Any]:
+    """
+    Describe who holds a lease.
+
+    Returns:
+        Dictionary with the holder (None if free or expired), its expiry,
+        this worker's ID and whether this worker is the holder
+    """
+    lease: Optional[SyncLease] = db.get(SyncLease, name)
+    active = lease is not None and lease.expires_at is not None and lease.expires_at >= datetime.utcnow()
+
+    return {
+        "holder": lease.holder if active else None,
+        "expires_at": lease.expires_at if active else None,
+        "worker_id": WORKER_ID,
+        "is_leader": active and lease.holder == WORKER_ID,
+    }
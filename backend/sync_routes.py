@@ -0,0 +1,42 @@
+"""Sync run history API routes."""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from database import get_db
+from models import SyncRun
+from schemas import SyncRunResponse
+
+router = APIRouter(prefix="/api/sync", tags=["Sync"])
+
+
+@router.get("/runs", response_model=List[SyncRunResponse])
+def get_sync_runs(
+    job: Optional[str] = None,
+    status: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    List sync runs, newest first.
+    
+    Args:
+        job: Only runs of this job ("google_sheets" or "mynaga")
+        status: Only runs with this status (running, success, not_modified, partial, failed)
+        skip: Number of runs to skip
+        limit: Maximum number of runs to return
+        db: Database session
+        
+    Returns:
+        Sync runs with timings, row counts and errors
+    """
+    query = db.query(SyncRun)
+    
+    if job:
+        query = query.filter(SyncRun.job == job)
+    if status:
+        query = query.filter(SyncRun.status == status)
+    
+    return query.order_by(SyncRun.id.desc()).offset(skip).limit(limit).all()
@@ -0,0 +1,157 @@
+"""Long-lived event loop and shared HTTP connection pools for background syncs."""
+import asyncio
+import logging
+import ssl
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Dict, Optional, Tuple
+
+import aiohttp
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# One pooled session per (event loop, verify_ssl). aiohttp sessions are bound
+# to the loop they were created on, so the sync runtime and the API server
+# each get their own pool.
+_http_sessions: Dict[Tuple[asyncio.AbstractEventLoop, bool], aiohttp.ClientSession] = {}
+
+
+def get_http_session(verify_ssl: bool = True) -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session for the running event loop.
+
+    Connections are kept alive and reused across syncs, so repeated calls
+    to the same host skip the TCP and TLS handshakes. Callers must not
+    close the returned session.
+
+    Args:
+        verify_ssl: Verify server certificates (False only for hosts that need it)
+
+    Returns:
+        Pooled aiohttp ClientSession
+    """
+    loop = asyncio.get_running_loop()
+    key = (loop, verify_ssl)
+
+    session = _http_sessions.get(key)
+    if session is None or session.closed:
+        ssl_context = ssl.create_default_context()
+        if not verify_ssl:
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+
+        connector = aiohttp.TCPConnector(
+            ssl=ssl_context,
+            limit=settings.http_pool_size,
+            keepalive_timeout=settings.http_keepalive_seconds,
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        _http_sessions[key] = session
+    return session
+
+
+async def close_http_sessions():
+    """Close the shared sessions that belong to the running event loop."""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _http_sessions if key[0] is loop]:
+        session = _http_sessions.pop(key)
+        if not session.closed:
+            await session.close()
+
+
+class SyncRuntime:
+    """A dedicated thread running one persistent event loop for sync jobs."""
+
+    def __init__(self):
+        """Initialize the runtime; the loop starts on first use."""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the runtime loop is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """
+        Start the runtime loop if it is not running yet.
+
+        Returns:
+            The runtime's event loop
+        """
+        with self._lock:
+            if not self.running:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run_loop,
+                    name="sync-runtime",
+                    daemon=True
+                )
+                self._thread.start()
+                logger.info("Sync runtime started")
+            return self._loop
+
+    def _run_loop(self):
+        """Thread target: run the loop until stop() is called."""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        Schedule a coroutine on the runtime loop.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            concurrent.futures.Future with the coroutine's result
+        """
+        loop = self.start()
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the runtime loop and wait for its result.
+
+        Used by scheduler jobs, which run on APScheduler worker threads.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait (default: no limit)
+
+        Returns:
+            The coroutine's result
+        """
+        return self.submit(coro).result(timeout)
+
+    def stop(self, timeout: float = 10):
+        """
+        Close the runtime's HTTP sessions and stop its loop.
+
+        Args:
+            timeout: Seconds to wait for the loop thread to exit
+        """
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self._loop, self._thread
+
+            try:
+                asyncio.run_coroutine_threadsafe(close_http_sessions(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Failed to close sync runtime HTTP sessions: {e}")
+
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+            self._loop = None
+            self._thread = None
+            logger.info("Sync runtime stopped")
+
+
+# Global sync runtime
+sync_runtime = SyncRuntime()
@@ -0,0 +1,58 @@
+"""Shared fixtures: a throwaway SQLite database and an API test client."""
+import os
+import sys
+import tempfile
+
+# Backend modules use flat imports and read settings at import time, so the
+# path and database must be set before anything from the app is imported
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+_db_dir = tempfile.mkdtemp(prefix="mynaga-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["DEBUG"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from case_stats import rebuild_case_counters
+from database import SessionLocal, engine, init_db
+from models import Base
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema once per test run."""
+    init_db()
+    yield engine
+
+
+@pytest.fixture(autouse=True)
+def clean_tables(database):
+    """Empty every table after each test."""
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    db = SessionLocal()
+    try:
+        rebuild_case_counters(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def db():
+    """A database session."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    """API client (startup hooks are not run, so no schedulers start)."""
+    import main
+    return TestClient(main.app)
@@ -0,0 +1,44 @@
+"""Tests for case change events."""
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import insert
+
+import case_events
+from case_events import start_feed_watcher
+from config import settings
+from database import SessionLocal, engine
+from event_broker import broker
+from models import CaseChange
+
+
+def commit_elsewhere():
+    """A change committed by another process: only the feed sees it."""
+    with engine.begin() as connection:
+        connection.execute(insert(CaseChange.__table__), [
+            {"case_id": 1, "control_no": "OTH-251001-0001", "action": "updated", "changed_at": datetime.utcnow()}
+        ])
+
+
+def test_watcher_publishes_changes_committed_by_other_processes(monkeypatch):
+    monkeypatch.setattr(settings, "events_feed_poll_seconds", 0.05)
+
+    async def scenario():
+        queue = broker.subscribe()
+        try:
+            start_feed_watcher(SessionLocal)
+            await asyncio.sleep(0.2)
+            assert queue.empty()  # Nothing new yet
+
+            await asyncio.to_thread(commit_elsewhere)
+            first = await asyncio.wait_for(queue.get(), timeout=2)
+            second = await asyncio.wait_for(queue.get(), timeout=2)
+            await asyncio.sleep(0.2)
+            return [first["type"], second["type"]], queue.empty()
+        finally:
+            broker.unsubscribe(queue)
+            await asyncio.wait_for(case_events._watcher_task, timeout=2)
+
+    types, drained = asyncio.run(scenario())
+    assert types == ["cases_changed", "stats_changed"]
+    assert drained  # Published once per feed move
@@ -0,0 +1,56 @@
+"""Tests for the case change feed."""
+from case_feed import FEED_LOCK_KEY, _log, read_case_changes
+from models import Case
+
+
+class RecordingConnection:
+    def __init__(self, dialect_name):
+        self.dialect = type("Dialect", (), {"name": dialect_name})()
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+
+
+class RecordingSession:
+    def __init__(self, dialect_name):
+        self.recorded = RecordingConnection(dialect_name)
+
+    def connection(self):
+        return self.recorded
+
+
+ENTRY = {"case_id": 1, "control_no": "OTH-251001-0001", "action": "updated", "changed_at": None}
+
+
+def test_postgresql_writers_take_feed_lock_before_ids():
+    session = RecordingSession("postgresql")
+
+    _log(session, [ENTRY])
+
+    (lock, lock_params), (insert, _) = session.recorded.statements
+    assert "pg_advisory_xact_lock" in lock and lock_params == {"key": FEED_LOCK_KEY}
+    assert insert.startswith("INSERT INTO case_changes")
+
+
+def test_sqlite_writers_need_no_lock():
+    session = RecordingSession("sqlite")
+
+    _log(session, [ENTRY])
+
+    assert [statement for statement, _ in session.recorded.statements if "advisory" in statement] == []
+
+
+def test_feed_pages_through_changes(db):
+    cases = [Case(control_no=f"OTH-251001-{i:04d}", category="Road") for i in range(3)]
+    db.add_all(cases)
+    db.commit()
+    cases[0].office = "City Engineer"
+    db.commit()
+
+    first = read_case_changes(db, 0, 2)
+    second = read_case_changes(db, first["next_since"], 2)
+
+    assert first["has_more"] and not second["has_more"]
+    assert first["case_ids"] + second["case_ids"] == [cases[0].id, cases[1].id, cases[2].id, cases[0].id]
+    assert read_case_changes(db, second["next_since"], 2)["case_ids"] == []
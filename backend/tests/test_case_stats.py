@@ -0,0 +1,24 @@
+"""Tests for the incrementally maintained case counters."""
+from case_stats import COUNTERS_ID, rebuild_case_counters
+from models import Case, CaseCounters
+
+
+def stored_counters(db):
+    db.expire_all()
+    row = db.get(CaseCounters, COUNTERS_ID)
+    return {"open": row.open_cases, "resolved": row.resolved_cases, "aging_sum": row.aging_sum}
+
+
+def test_change_to_expired_case_moves_counters(db):
+    case = Case(control_no="OTH-251001-0001", category="Road", status="OPEN", case_aging=2)
+    db.add(case)
+    db.commit()  # Expires the instance: its old values are no longer loaded
+
+    case.status = "RESOLVED"
+    case.case_aging = 5
+    db.commit()
+
+    assert stored_counters(db) == {"open": 0, "resolved": 1, "aging_sum": 5}
+    counters = rebuild_case_counters(db)
+    db.rollback()
+    assert (counters["open_cases"], counters["resolved_cases"]) == (0, 1)
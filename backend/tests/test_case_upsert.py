@@ -0,0 +1,97 @@
+"""Tests for bulk case upserts."""
+import case_upsert
+from case_stats import COUNTERS_ID, rebuild_case_counters
+from case_upsert import bulk_upsert_cases, load_case_keys
+from models import Case, CaseCounters
+
+COUNTER_COLUMNS = ["total_cases", "open_cases", "resolved_cases", "rerouting_cases", "aging_sum", "aging_count"]
+
+
+def record(i, status="OPEN", aging=None, description="pothole"):
+    """A case record as the syncs build them."""
+    return {
+        "control_no": f"OTH-251001-{i:04d}",
+        "category": "Road",
+        "description": description,
+        "status": status,
+        "case_aging": aging,
+    }
+
+
+def counters(db):
+    """Stored counter values."""
+    db.expire_all()
+    row = db.get(CaseCounters, COUNTERS_ID)
+    return {column: getattr(row, column) for column in COUNTER_COLUMNS}
+
+
+def recount(db):
+    """Counter values from a full aggregate pass."""
+    values = rebuild_case_counters(db)
+    db.rollback()
+    return values
+
+
+def test_counts_created_updated_unchanged(db):
+    assert bulk_upsert_cases(db, [record(i) for i in range(3)], "sheet") == {"created": 3, "updated": 0, "unchanged": 0}
+    db.commit()
+
+    changed = [record(0, description="flooded"), record(1), record(2), record(3)]
+    assert bulk_upsert_cases(db, changed, "sheet") == {"created": 1, "updated": 1, "unchanged": 2}
+    db.commit()
+    assert db.query(Case).count() == 4
+
+
+def test_counters_follow_inserts_and_updates_without_recount(db, monkeypatch):
+    bulk_upsert_cases(db, [record(0), record(1, "RESOLVED", 3), record(2, "FOR REROUTING", 5)], "sheet")
+    db.commit()
+
+    # None keeps the stored aging; status changes move the case between counters
+    bulk_upsert_cases(db, [record(0, "RESOLVED", 2), record(1, "OPEN"), record(3, aging=1)], "sheet")
+    db.commit()
+
+    # Deltas only: no aggregate pass on the way
+    def rebuild(db):
+        raise AssertionError("counters were rebuilt")
+    monkeypatch.setattr(case_upsert, "rebuild_case_counters", rebuild)
+    bulk_upsert_cases(db, [record(4)], "sheet")
+    db.commit()
+
+    assert counters(db) == recount(db)
+    assert counters(db)["total_cases"] == 5
+
+
+def test_conflicting_inserts_are_not_counted_as_created(db, monkeypatch):
+    bulk_upsert_cases(db, [record(0), record(1)], "sheet")
+    db.commit()
+
+    # Another writer inserted the rows after this upsert loaded the keys
+    monkeypatch.setattr(case_upsert, "load_case_keys", lambda db, hash_column, control_nos: {})
+    stats = bulk_upsert_cases(db, [record(0), record(1), record(2)], "sheet")
+    db.commit()
+
+    assert stats["created"] == 1
+    assert db.query(Case).count() == 3
+    assert counters(db) == recount(db)
+
+
+
+def test_sources_keep_separate_fingerprints(db):
+    # Both sources sync the same case; each compares against its own last fingerprint
+    sheet_row = record(0, description="pothole")
+    report = {**record(0, description="pothole on Magsaysay Ave"), "mynaga_id": "abc123"}
+    bulk_upsert_cases(db, [sheet_row], "sheet")
+    bulk_upsert_cases(db, [report], "mynaga")
+    db.commit()
+
+    assert bulk_upsert_cases(db, [sheet_row], "sheet") == {"created": 0, "updated": 0, "unchanged": 1}
+    assert bulk_upsert_cases(db, [report], "mynaga") == {"created": 0, "updated": 0, "unchanged": 1}
+
+
+def test_key_lookup_is_limited_to_the_batch(db):
+    bulk_upsert_cases(db, [record(i) for i in range(3)], "sheet")
+    db.commit()
+
+    keys = load_case_keys(db, "sheet_hash", [record(1)["control_no"], "OTH-251001-9999"])
+
+    assert list(keys) == [record(1)["control_no"]]
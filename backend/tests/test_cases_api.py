@@ -0,0 +1,86 @@
+"""Tests for the case list endpoint."""
+import pytest
+from sqlalchemy import event
+
+from database import engine
+from models import Case, CaseUpdate, Tag
+
+
+@pytest.fixture
+def cases(db):
+    """40 cases, each with two tags and two updates."""
+    for i in range(40):
+        case = Case(control_no=f"OTH-251001-{i:04d}", category="Road", description=f"pothole {i}")
+        case.tags = [Tag(tag_name="a"), Tag(tag_name="b")]
+        case.updates = [CaseUpdate(update_text="seen", updated_by="staff"), CaseUpdate(update_text="fixed", updated_by="staff")]
+        db.add(case)
+    db.commit()
+
+
+def count_queries(run):
+    """Run a callable and return how many SQL statements it executed."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+@pytest.mark.parametrize("include", ["tags,updates", ""])
+def test_query_count_does_not_grow_with_page_size(client, cases, include):
+    def fetch(limit):
+        response = client.get("/api/cases", params={"limit": limit, "include": include})
+        assert response.status_code == 200
+        assert len(response.json()) == limit
+
+    assert count_queries(lambda: fetch(5)) == count_queries(lambda: fetch(30))
+
+
+def test_include_controls_embedded_relationships(client, cases):
+    embedded = client.get("/api/cases", params={"limit": 1}).json()[0]
+    assert len(embedded["tags"]) == 2
+    assert len(embedded["updates"]) == 2
+
+    bare = client.get("/api/cases", params={"limit": 1, "include": ""}).json()[0]
+    assert bare["tags"] == []
+    assert bare["updates"] == []
+
+
+def test_cursor_pages_do_not_skip_or_repeat_cases(client, cases):
+    seen = []
+    params = {"limit": 7, "include": ""}
+    while True:
+        response = client.get("/api/cases", params=params)
+        seen += [case["id"] for case in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+
+    assert len(seen) == 40
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_ranked_search_pages_have_no_cursor(client, db):
+    for i in range(10):
+        # Different match counts give the cases different relevance
+        db.add(Case(control_no=f"OTH-251002-{i:04d}", category="Road", description="flood " * (i % 3 + 1)))
+    db.commit()
+
+    response = client.get("/api/cases", params={"search": "flood", "limit": 2, "include": ""})
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+
+    # Offset paging covers every match exactly once
+    seen = []
+    for skip in range(0, 10, 2):
+        page = client.get("/api/cases", params={"search": "flood", "skip": skip, "limit": 2, "include": ""})
+        seen += [case["id"] for case in page.json()]
+    assert sorted(seen) == sorted(set(seen))
+    assert len(seen) == 10
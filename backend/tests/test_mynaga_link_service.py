@@ -0,0 +1,112 @@
+"""Tests for the per-day MyNaga report ID cache."""
+import asyncio
+from collections import Counter
+from datetime import date
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import mynaga_link_service
+from mynaga_link_service import ReportIdCache
+from sync_runtime import close_http_sessions
+
+DAY = date(2025, 10, 1)
+
+
+def control_no(day, i):
+    return f"OTH-{day:%y%m%d}-{i:04d}"
+
+
+@pytest.fixture
+def api():
+    """Fake reports endpoint: requests per day, and days that fail."""
+    return {"requests": Counter(), "failing": set()}
+
+
+@pytest.fixture
+def run(api, monkeypatch):
+    """Run a coroutine function against the fake API."""
+    async def list_reports(request):
+        day = date.fromisoformat(request.query["date_created_from"][:10])
+        api["requests"][day] += 1
+        await asyncio.sleep(0.05)  # Keep the request in flight for concurrent callers
+        if day in api["failing"]:
+            return web.Response(status=500, text="upstream timeout")
+        return web.json_response([
+            {"_id": f"{day:%m%d}-{i}", "control_number": control_no(day, i)} for i in range(3)
+        ])
+
+    async def main(scenario):
+        app = web.Application()
+        app.router.add_get("/api/reports", list_reports)
+        server = TestServer(app)
+        await server.start_server()
+        monkeypatch.setattr(mynaga_link_service, "MYNAGA_API_BASE", str(server.make_url("/api/reports")))
+        try:
+            return await scenario()
+        finally:
+            await close_http_sessions()
+            await server.close()
+
+    return lambda scenario: asyncio.run(main(scenario))
+
+
+def test_concurrent_misses_share_one_request(api, run):
+    cache = ReportIdCache(ttl_seconds=600, max_days=10)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_day(DAY) for _ in range(10)))
+
+    results = run(scenario)
+
+    assert api["requests"] == {DAY: 1}
+    assert all(result == results[0] for result in results)
+    assert results[0][control_no(DAY, 2)] == "1001-2"
+
+
+def test_failures_are_not_cached(api, run):
+    cache = ReportIdCache(ttl_seconds=600, max_days=10)
+    api["failing"].add(DAY)
+
+    async def scenario():
+        failed = await cache.get_day(DAY)
+        api["failing"].clear()
+        return failed, await cache.get_day(DAY), await cache.get_day(DAY)
+
+    failed, fetched, cached = run(scenario)
+
+    assert failed is None
+    assert fetched == cached and control_no(DAY, 0) in fetched
+    assert api["requests"] == {DAY: 2}
+
+
+def test_days_expire_after_ttl(api, run):
+    cache = ReportIdCache(ttl_seconds=0.2, max_days=10)
+
+    async def scenario():
+        await cache.get_day(DAY)
+        await cache.get_day(DAY)
+        await asyncio.sleep(0.25)
+        await cache.get_day(DAY)
+
+    run(scenario)
+
+    assert api["requests"] == {DAY: 2}
+
+
+def test_least_recently_used_day_is_evicted(api, run):
+    cache = ReportIdCache(ttl_seconds=600, max_days=2)
+    first, second, third = date(2025, 10, 1), date(2025, 10, 2), date(2025, 10, 3)
+
+    async def scenario():
+        await cache.get_day(first)
+        await cache.get_day(second)
+        await cache.get_day(first)  # Hit: `second` is now least recently used
+        await cache.get_day(third)  # Evicts `second`
+        await cache.get_day(first)
+        await cache.get_day(second)
+
+    run(scenario)
+
+    assert api["requests"] == {first: 1, second: 2, third: 1}
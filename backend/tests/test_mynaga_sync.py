@@ -0,0 +1,177 @@
+"""Tests for the MyNaga sync against a local aiohttp server."""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from config import settings
+from models import Case, SyncWatermark
+from mynaga_sync import WATERMARK_NAME, MyNagaAPIClient, MyNagaSyncService, sync_mynaga_data
+from sync_runtime import close_http_sessions
+
+TODAY = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+MONTH_START = TODAY.replace(day=1)
+
+
+def report(i, status="new"):
+    """A report as the MyNaga API returns it."""
+    return {
+        "_id": f"oid{i}",
+        "control_number": f"OTH-{TODAY:%y%m%d}-{i:04d}",
+        "date_created": TODAY.isoformat(),
+        "report_type": {"name": "Road"},
+        "barangay": {"name": "Concepcion Pequeña"},
+        "description": f"pothole {i}",
+        "user": {"name": "Juan", "mobile": "09170000000"},
+        "report_cluster": {"status": status},
+        "images": [],
+    }
+
+
+def parse(value):
+    return datetime.fromisoformat(value.replace("Z", ""))
+
+
+@pytest.fixture
+def reports():
+    """Reports served by the fake API; tests edit the list between syncs."""
+    return [report(i) for i in range(3)]
+
+
+@pytest.fixture
+def served():
+    """(date_created_from, date_created_to) of every request the fake API served."""
+    return []
+
+
+@pytest.fixture
+def failing_days():
+    """Window start dates the fake API answers with a server error."""
+    return set()
+
+
+@pytest.fixture
+def run_sync(db, reports, served, failing_days, monkeypatch):
+    """Run sync_mynaga_data against a local server serving `reports`."""
+    async def list_reports(request):
+        assert request.headers["Authorization"] == "token"
+        start = parse(request.query["date_created_from"])
+        end = parse(request.query["date_created_to"])
+        served.append((start, end))
+        if start.date() in failing_days:
+            return web.Response(status=500, text="upstream timeout")
+        return web.json_response([r for r in reports if start <= parse(r["date_created"]) < end])
+
+    async def run(full):
+        app = web.Application()
+        app.router.add_get("/api/reports", list_reports)
+        server = TestServer(app)
+        await server.start_server()
+        monkeypatch.setattr(MyNagaAPIClient, "BASE_URL", str(server.make_url("/api")))
+        try:
+            return await sync_mynaga_data("token", db, full=full)
+        finally:
+            await close_http_sessions()
+            await server.close()
+
+    return lambda full=False: asyncio.run(run(full))
+
+
+def test_sync_counts_and_no_duplicates(db, reports, run_sync):
+    first = run_sync(full=True)
+    assert (first["created"], first["updated"], first["unchanged"], first["errors"]) == (3, 0, 0, 0)
+
+    # The next run is incremental: unchanged reports are not rewritten
+    second = run_sync()
+    assert second["mode"] == "incremental"
+    assert (second["created"], second["updated"], second["unchanged"]) == (0, 0, 3)
+    assert db.query(Case).count() == 3
+
+
+def test_sync_applies_changed_and_new_reports(db, reports, run_sync):
+    run_sync(full=True)
+
+    reports[0] = report(0, status="resolved")
+    reports.append(report(3))
+    stats = run_sync()
+
+    assert (stats["created"], stats["updated"], stats["unchanged"]) == (1, 1, 2)
+    assert db.query(Case).count() == 4
+    resolved = db.query(Case).filter(Case.control_no == reports[0]["control_number"]).one()
+    assert (resolved.status, resolved.mynaga_id) == ("RESOLVED", "oid0")
+
+
+def save_watermark(db, last_seen_at, last_full_sync_at):
+    db.add(SyncWatermark(name=WATERMARK_NAME, last_seen_at=last_seen_at, last_full_sync_at=last_full_sync_at))
+    db.commit()
+
+
+def watermark(db):
+    db.expire_all()
+    return db.get(SyncWatermark, WATERMARK_NAME)
+
+
+def plan(db, full=False):
+    return MyNagaSyncService("token", db)._plan_sync(full)
+
+
+def test_first_sync_is_full_from_month_start(db):
+    assert plan(db) == (True, MONTH_START)
+
+
+def test_recent_full_sync_makes_next_one_incremental_with_recheck(db):
+    last_seen = TODAY + timedelta(hours=1)
+    save_watermark(db, last_seen, datetime.utcnow() - timedelta(hours=1))
+
+    full, date_from = plan(db)
+
+    assert not full
+    assert date_from == max(last_seen - timedelta(days=settings.mynaga_recheck_days), MONTH_START)
+    assert plan(db, full=True) == (True, MONTH_START)
+
+
+def test_stale_or_last_month_full_sync_forces_full(db):
+    save_watermark(db, TODAY, datetime.utcnow() - timedelta(hours=settings.mynaga_full_sync_hours))
+    assert plan(db) == (True, MONTH_START)
+
+    mark = watermark(db)
+    mark.last_full_sync_at = MONTH_START - timedelta(seconds=1)
+    db.commit()
+    assert plan(db) == (True, MONTH_START)
+
+
+def test_incremental_sync_requests_only_the_recheck_window(db, served, run_sync):
+    run_sync(full=True)
+    served.clear()
+
+    stats = run_sync()
+
+    expected_from = max(TODAY - timedelta(days=settings.mynaga_recheck_days), MONTH_START)
+    assert stats["date_from"] == expected_from.isoformat()
+    assert min(start for start, _ in served) == expected_from
+
+
+def test_watermark_never_moves_backwards(db):
+    full_sync_at = datetime.utcnow() - timedelta(hours=1)
+    save_watermark(db, TODAY, full_sync_at)
+    service = MyNagaSyncService("token", db)
+
+    # An empty recheck window, then one that only saw older reports
+    service._save_watermark(None, False, datetime.utcnow())
+    service._save_watermark(TODAY - timedelta(days=1), False, datetime.utcnow())
+
+    mark = watermark(db)
+    assert (mark.last_seen_at, mark.last_full_sync_at) == (TODAY, full_sync_at)
+
+
+def test_failed_window_does_not_advance_watermark(db, reports, failing_days, run_sync):
+    failing_days.add(TODAY.date())
+
+    stats = run_sync(full=True)
+
+    assert stats["errors"] == 1 and "500" in stats["error_messages"][0]
+    assert watermark(db) is None  # The next run is full again
+    failing_days.clear()
+    assert run_sync()["mode"] == "full"
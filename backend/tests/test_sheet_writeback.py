@@ -0,0 +1,68 @@
+"""Tests for queueing case edits for Google Sheets write-back."""
+import json
+
+import pytest
+
+from case_upsert import bulk_upsert_cases
+from models import Case, SheetWriteOutbox
+from sync_history import JOB_GOOGLE_SHEETS, save_job_config
+
+
+@pytest.fixture
+def case_id(db):
+    case = Case(control_no="OTH-251001-0001", category="Road")
+    db.add(case)
+    db.commit()
+    return case.id
+
+
+def configure_sheet(sheet_url, credentials_json=None):
+    save_job_config(JOB_GOOGLE_SHEETS, {"sheet_url": sheet_url, "credentials_json": credentials_json}, 10)
+
+
+def queued(db):
+    return db.query(SheetWriteOutbox).count()
+
+
+def test_edit_is_queued_with_service_account(client, db, case_id):
+    configure_sheet("https://docs.google.com/spreadsheets/d/x/edit#gid=0", '{"type": "service_account"}')
+
+    assert client.put(f"/api/cases/{case_id}", json={"office": "City Engineer"}).status_code == 200
+    assert queued(db) == 1
+
+
+def test_only_changed_fields_are_queued(client, db, case_id):
+    configure_sheet("https://docs.google.com/spreadsheets/d/x/edit#gid=0", '{"type": "service_account"}')
+    case = db.get(Case, case_id)
+    form = {"cluster": case.cluster, "office": "City Engineer", "mynaga_app_status": case.mynaga_app_status}
+
+    assert client.put(f"/api/cases/{case_id}", json=form).status_code == 200
+    entry = db.query(SheetWriteOutbox).one()
+    assert json.loads(entry.payload) == {"control_no": "OTH-251001-0001", "office": "City Engineer"}
+
+
+def test_edit_is_not_queued_for_published_csv(client, db, case_id):
+    # Published-CSV syncs are read-only: nothing would ever drain the queue
+    configure_sheet("https://docs.google.com/spreadsheets/d/e/x/pub?output=csv")
+
+    assert client.put(f"/api/cases/{case_id}", json={"office": "City Engineer"}).status_code == 200
+    assert queued(db) == 0
+
+
+def test_sheet_sync_before_write_back_keeps_the_edit(client, db):
+    configure_sheet("https://docs.google.com/spreadsheets/d/x/edit#gid=0", '{"type": "service_account"}')
+    sheet_row = {"control_no": "OTH-251001-0002", "category": "Road", "office": "Old Office"}
+    bulk_upsert_cases(db, [sheet_row], "sheet")
+    db.commit()
+    case = db.query(Case).filter(Case.control_no == sheet_row["control_no"]).one()
+
+    assert client.put(f"/api/cases/{case.id}", json={"office": "City Engineer"}).status_code == 200
+    # The sheet still shows the old office until the outbox drains
+    assert bulk_upsert_cases(db, [sheet_row], "sheet") == {"created": 0, "updated": 0, "unchanged": 1}
+    db.commit()
+    db.refresh(case)
+    assert case.office == "City Engineer"
+
+    # Once written back, the sheet row is applied again
+    db.query(SheetWriteOutbox).delete()
+    assert bulk_upsert_cases(db, [{**sheet_row, "office": "City Engineer"}], "sheet")["updated"] == 1
@@ -0,0 +1,81 @@
+"""Sync jobs follow sync_job_configs, whichever worker received the request."""
+import pytest
+
+import scheduler
+from scheduler import reconcile_sync_jobs, sync_manager
+from sync_history import JOB_GOOGLE_SHEETS, JOB_MYNAGA, disable_job_config, save_job_config
+
+SHEET_URL = "https://docs.google.com/spreadsheets/d/sheet-id/edit#gid=0"
+
+
+@pytest.fixture
+def leader(monkeypatch):
+    """This process as the sync leader, with a paused scheduler so no job runs."""
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+    paused = BackgroundScheduler()
+    paused.start(paused=True)
+    monkeypatch.setattr(scheduler, "scheduler", paused)
+    monkeypatch.setattr(sync_manager, "hold_leadership", lambda: True)
+    yield paused
+    paused.shutdown(wait=False)
+    sync_manager.job_configs.clear()
+    sync_manager.mynaga_interval = None
+    sync_manager.sheets_interval = None
+
+
+def scheduled_ids(apscheduler):
+    return {job.id for job in apscheduler.get_jobs()}
+
+
+def test_leader_picks_up_job_started_on_another_worker(leader):
+    # Another worker handled /api/google-sheets/auto-sync/start: it only saved the config
+    save_job_config(JOB_GOOGLE_SHEETS, {"sheet_url": SHEET_URL, "credentials_json": None}, 10)
+
+    scheduler.sync_heartbeat()
+
+    assert scheduled_ids(leader) == {scheduler.sheets_sync_task_id, scheduler.sheets_outbox_task_id}
+    assert sync_manager.sheets_interval.base_seconds == 10
+
+
+def test_leader_follows_reconfiguration_and_stop(leader):
+    save_job_config(JOB_MYNAGA, {"auth_token": "old"}, 300)
+    reconcile_sync_jobs()
+    assert sync_manager.job_configs[JOB_MYNAGA] == ({"auth_token": "old"}, 300)
+
+    save_job_config(JOB_MYNAGA, {"auth_token": "new"}, 600)
+    reconcile_sync_jobs()
+    assert sync_manager.job_configs[JOB_MYNAGA] == ({"auth_token": "new"}, 600)
+    assert sync_manager.mynaga_interval.base_seconds == 600
+
+    disable_job_config(JOB_MYNAGA)
+    reconcile_sync_jobs()
+    assert JOB_MYNAGA not in sync_manager.job_configs
+    assert scheduled_ids(leader) == set()
+
+
+def test_unchanged_config_keeps_adapted_interval(leader):
+    save_job_config(JOB_MYNAGA, {"auth_token": "token"}, 300)
+    reconcile_sync_jobs()
+    sync_manager.mynaga_interval.record(changed=False)
+
+    reconcile_sync_jobs()
+
+    assert sync_manager.mynaga_interval.current_seconds == 600
+
+
+def test_non_leader_runs_no_jobs(leader, monkeypatch):
+    save_job_config(JOB_MYNAGA, {"auth_token": "token"}, 300)
+    reconcile_sync_jobs()
+
+    monkeypatch.setattr(sync_manager, "hold_leadership", lambda: False)
+    scheduler.sync_heartbeat()
+
+    assert sync_manager.job_configs == {}
+    assert scheduled_ids(leader) == set()
+
+
+def test_sheets_config_is_read_from_the_database():
+    assert sync_manager.sheets_config is None
+    save_job_config(JOB_GOOGLE_SHEETS, {"sheet_url": SHEET_URL, "credentials_json": "{}"}, 10)
+    assert sync_manager.sheets_config == {"sheet_url": SHEET_URL, "credentials_json": "{}"}
@@ -0,0 +1,46 @@
+"""The API stays responsive while a sync waits on Google Sheets."""
+import asyncio
+import time
+
+import httpx
+
+import google_sheets_auth
+
+SHEET_DELAY = 1.5
+
+
+class SlowSheetsClient:
+    """Stands in for the Sheets API client; every read takes SHEET_DELAY seconds."""
+
+    def read_sheet(self, spreadsheet_id, range_name=None, gid=None):
+        time.sleep(SHEET_DELAY)
+        return {"values": [["Control No.", "Category"], ["OTH-251001-0001", "Road"]]}
+
+
+def test_stats_answer_quickly_during_slow_sheet_fetch(monkeypatch):
+    import main
+
+    monkeypatch.setattr(google_sheets_auth, "get_sheets_client", lambda credentials_json: SlowSheetsClient())
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            sync = asyncio.create_task(client.post("/api/google-sheets/sync", json={
+                "sheet_url": "https://docs.google.com/spreadsheets/d/sheet-id/edit#gid=0",
+                "credentials_json": '{"type": "service_account"}',
+            }))
+            await asyncio.sleep(0.2)  # Let the sync reach the sheet read
+
+            started = time.perf_counter()
+            stats = await client.get("/api/stats")
+            stats_seconds = time.perf_counter() - started
+
+            assert not sync.done()
+            response = await sync
+            return stats, stats_seconds, response
+
+    stats, stats_seconds, sync_response = asyncio.run(scenario())
+
+    assert stats.status_code == 200
+    assert sync_response.status_code == 200
+    assert stats_seconds < 0.5
@@ -286,8 +286,10 @@ export default function CaseModal({ isOpen, onClose, caseData }) {
       if (caseData) {
         setFormData(caseData)
       }
-      // Fetch MyNaga link
-      if (caseData?.control_no) {
+      // MyNaga link: stored on the case once resolved, otherwise fetch it
+      if (caseData?.mynaga_id) {
+        setMynagaLink(`https://mynaga.app/reports?_id=${caseData.mynaga_id}`)
+      } else if (caseData?.control_no) {
         fetchMynagaLink(caseData.control_no)
       }
     }
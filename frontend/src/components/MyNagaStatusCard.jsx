@@ -1,6 +1,7 @@
 import { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import api from '../services/api';
+import { subscribeEvents } from '../services/events';
 
 const MyNagaStatusCard = () => {
   const navigate = useNavigate();
@@ -17,6 +18,7 @@ const MyNagaStatusCard = () => {
   const [lastUpdated, setLastUpdated] = useState(null);
   const [isRefreshing, setIsRefreshing] = useState(false);
   const [selectedStatus, setSelectedStatus] = useState(null);
+  const [isLive, setIsLive] = useState(false);
 
   const fetchStats = async () => {
     try {
@@ -36,10 +38,31 @@ const MyNagaStatusCard = () => {
   useEffect(() => {
     fetchStats();
     
-    // Auto-refresh every 10 seconds (10000 milliseconds)
-    const interval = setInterval(fetchStats, 10000);
+    // Refresh when the server reports case changes; poll every 10 seconds
+    // (10000 milliseconds) only while the live connection is down
+    let interval = null;
+    const unsubscribe = subscribeEvents(
+      (event) => {
+        if (event.type === 'stats_changed' || event.type === 'resync') {
+          fetchStats();
+        }
+      },
+      (connected) => {
+        setIsLive(connected);
+        clearInterval(interval);
+        interval = null;
+        if (connected) {
+          fetchStats();
+        } else {
+          interval = setInterval(fetchStats, 10000);
+        }
+      }
+    );
     
-    return () => clearInterval(interval);
+    return () => {
+      unsubscribe();
+      clearInterval(interval);
+    };
   }, []);
 
   // Handle status card click - navigate to cases with filter
@@ -262,7 +285,9 @@ const MyNagaStatusCard = () => {
           <div className="flex items-center gap-3 text-gray-600">
             <div className="flex items-center gap-2">
               <div className={`w-1.5 h-1.5 rounded-full ${isRefreshing ? 'bg-green-600' : 'bg-blue-600'}`}></div>
-              <span className="font-medium">Auto-refresh interval: 10 seconds</span>
+              <span className="font-medium">
+                {isLive ? 'Live updates' : 'Auto-refresh interval: 10 seconds'}
+              </span>
             </div>
           </div>
           <div className="flex items-center gap-2 text-gray-500 bg-gray-50 px-3 py-1.5 rounded border border-gray-200">
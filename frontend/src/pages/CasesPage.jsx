@@ -1,23 +1,37 @@
-import React, { useEffect, useState } from 'react'
+import React, { useEffect, useRef, useState } from 'react'
 import { useSearchParams } from 'react-router-dom'
 import { FiDownload, FiUpload, FiPlus, FiSearch } from 'react-icons/fi'
 import { caseAPI, fileAPI } from '../services/api'
+import { subscribeEvents } from '../services/events'
 import { useCaseStore } from '../store'
 import CaseModal from '../components/CaseModal'
 import CaseTable from '../components/CaseTable'
 
+// Cases fetched per page; further pages are loaded on demand
+const PAGE_SIZE = 200
+
 export default function CasesPage() {
   const [searchParams, setSearchParams] = useSearchParams()
   const cases = useCaseStore((state) => state.cases)
   const setCases = useCaseStore((state) => state.setCases)
   const filters = useCaseStore((state) => state.filters)
   const setFilters = useCaseStore((state) => state.setFilters)
+  const applyCaseChanges = useCaseStore((state) => state.applyCaseChanges)
 
   const [isModalOpen, setIsModalOpen] = useState(false)
   const [selectedCase, setSelectedCase] = useState(null)
   const [isLoading, setIsLoading] = useState(false)
   const [searchTerm, setSearchTerm] = useState('')
   const [mynagaStatusFilter, setMynagaStatusFilter] = useState('')
+  // Where the next page starts ({ cursor } or { skip } for ranked searches), null when done
+  const [nextPage, setNextPage] = useState(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
+
+  // Change feed position of the loaded list, and whether a feed read is running
+  const sinceRef = useRef(null)
+  // Whether the list has pages left to load (read by the feed handler)
+  const morePagesRef = useRef(false)
+  const feedStateRef = useRef({ running: false, pending: false })
 
   useEffect(() => {
     // Check if there's a mynaga_status filter from URL
@@ -31,24 +45,100 @@ export default function CasesPage() {
     loadCases()
   }, [filters, mynagaStatusFilter])
 
+  // Keep the list current from the change feed whenever the server reports
+  // case changes, instead of reloading it
+  useEffect(() => {
+    const unsubscribe = subscribeEvents((event) => {
+      if (event.type === 'resync') {
+        loadCases()
+      } else if (event.type === 'cases_changed') {
+        syncChanges()
+      }
+    })
+    return unsubscribe
+  }, [filters, mynagaStatusFilter])
+
+  // Filters that can be checked on the client (search ranking cannot)
+  const matchesFilters = (c) =>
+    (!filters.status || c.status === filters.status) &&
+    (!filters.category || c.category === filters.category) &&
+    (!filters.barangay || c.barangay === filters.barangay) &&
+    (!mynagaStatusFilter || c.mynaga_app_status === mynagaStatusFilter)
+
+  const syncChanges = async () => {
+    const feedState = feedStateRef.current
+    if (sinceRef.current === null) return
+    if (feedState.running) {
+      feedState.pending = true
+      return
+    }
+
+    feedState.running = true
+    try {
+      let hasMore = true
+      while (hasMore) {
+        const res = await caseAPI.getChanges(sinceRef.current)
+        const { changes, deleted, next_since, has_more, reset } = res.data
+        const known = new Set(useCaseStore.getState().cases.map((c) => c.id))
+        const hasNew = changes.some((c) => !known.has(c.id))
+
+        if (reset || (filters.search && hasNew)) {
+          // Feed no longer covers our position, or new rows need a search: reload
+          loadCases()
+          return
+        }
+
+        applyCaseChanges(changes, deleted.map((d) => d.id), matchesFilters, !morePagesRef.current)
+        sinceRef.current = next_since
+        hasMore = has_more
+      }
+    } catch (error) {
+      console.error('Error applying case changes:', error)
+    } finally {
+      feedState.running = false
+      if (feedState.pending) {
+        feedState.pending = false
+        syncChanges()
+      }
+    }
+  }
+
+  // Fetch one page: keyset pages follow the cursor, ranked search pages use offsets
+  const fetchPage = async (page) => {
+    const params = {
+      status: filters.status,
+      category: filters.category,
+      barangay: filters.barangay,
+      search: filters.search,
+      include: '',  // Table view doesn't show tags/updates
+    }
+    const skip = page.skip || 0
+    const res = page.cursor
+      ? await caseAPI.getPage(page.cursor, PAGE_SIZE, params)
+      : await caseAPI.getAll(skip, PAGE_SIZE, params)
+
+    let next = null
+    if (res.data.length === PAGE_SIZE) {
+      const cursor = res.headers['x-next-cursor']
+      next = cursor ? { cursor } : { skip: skip + PAGE_SIZE }
+    }
+    setNextPage(next)
+    morePagesRef.current = next !== null
+
+    // Filter by MyNaga status if specified
+    return mynagaStatusFilter
+      ? res.data.filter(c => c.mynaga_app_status === mynagaStatusFilter)
+      : res.data
+  }
+
   const loadCases = async () => {
     setIsLoading(true)
     try {
-      // Request all cases (10000 limit - effectively no limit for most use cases)
-      const res = await caseAPI.getAll(0, 10000, {
-        status: filters.status,
-        category: filters.category,
-        barangay: filters.barangay,
-        search: filters.search,
-      })
+      // Feed position first, so changes made during the load are replayed
+      const head = await caseAPI.getChanges()
       
-      // Filter by MyNaga status if specified
-      let filteredCases = res.data
-      if (mynagaStatusFilter) {
-        filteredCases = res.data.filter(c => c.mynaga_app_status === mynagaStatusFilter)
-      }
-      
-      setCases(filteredCases)
+      setCases(await fetchPage({}))
+      sinceRef.current = head.data.next_since
     } catch (error) {
       console.error('Error loading cases:', error)
     } finally {
@@ -56,6 +146,22 @@ export default function CasesPage() {
     }
   }
 
+  const loadMoreCases = async () => {
+    if (!nextPage || isLoadingMore) return
+    setIsLoadingMore(true)
+    try {
+      const page = await fetchPage(nextPage)
+      // Rows may have moved in from the change feed meanwhile
+      const loaded = useCaseStore.getState().cases
+      const known = new Set(loaded.map((c) => c.id))
+      setCases([...loaded, ...page.filter((c) => !known.has(c.id))])
+    } catch (error) {
+      console.error('Error loading more cases:', error)
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }
+
   const handleSearch = (e) => {
     const value = e.target.value
     setSearchTerm(value)
@@ -158,6 +264,18 @@ export default function CasesPage() {
         />
       )}
 
+      {!isLoading && nextPage && (
+        <div className="text-center mt-6">
+          <button
+            onClick={loadMoreCases}
+            disabled={isLoadingMore}
+            className="btn btn-secondary"
+          >
+            {isLoadingMore ? 'Loading...' : 'Load more cases'}
+          </button>
+        </div>
+      )}
+
       <CaseModal
         isOpen={isModalOpen}
         onClose={() => {
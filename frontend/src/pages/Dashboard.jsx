@@ -1,5 +1,6 @@
 import React, { useEffect, useState } from 'react'
 import { statsAPI, caseAPI } from '../services/api'
+import { subscribeEvents } from '../services/events'
 import MyNagaStatusCard from '../components/MyNagaStatusCard'
 import {
   LineChart,
@@ -22,12 +23,33 @@ export default function Dashboard() {
   useEffect(() => {
     loadStats()
     
-    // Auto-refresh every 10 seconds for real-time updates
-    const refreshInterval = setInterval(() => {
-      loadStats()
-    }, 10000) // 10 seconds
+    // Stats are pushed by the server; poll every 10 seconds only while the
+    // live connection is down
+    let refreshInterval = null
+    const unsubscribe = subscribeEvents(
+      (event) => {
+        if (event.type === 'stats_changed') {
+          setStats(event.data)
+          setLastUpdate(new Date())
+        } else if (event.type === 'resync') {
+          loadStats()
+        }
+      },
+      (connected) => {
+        clearInterval(refreshInterval)
+        refreshInterval = null
+        if (connected) {
+          loadStats()  // Catch up on anything missed while disconnected
+        } else {
+          refreshInterval = setInterval(loadStats, 10000)
+        }
+      }
+    )
     
-    return () => clearInterval(refreshInterval)
+    return () => {
+      unsubscribe()
+      clearInterval(refreshInterval)
+    }
   }, [])
 
   const loadStats = async () => {
@@ -12,8 +12,16 @@ export const caseAPI = {
   getAll: (skip = 0, limit = 100, filters = {}) =>
     API.get('/cases', { params: { skip, limit, ...filters } }),
   
+  // Keyset pagination: pass the X-Next-Cursor header of the previous page
+  getPage: (cursor = null, limit = 100, filters = {}) =>
+    API.get('/cases', { params: { cursor, limit, ...filters } }),
+  
   getById: (id) => API.get(`/cases/${id}`),
   
+  // Change feed: omit `since` to get the current sequence number
+  getChanges: (since = null, limit = 1000) =>
+    API.get('/cases/changes', { params: { since, limit, include: '' } }),
+  
   create: (data) => API.post('/cases', data),
   
   update: (id, data) => API.put(`/cases/${id}`, data),
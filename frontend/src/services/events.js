@@ -0,0 +1,82 @@
+// Live server events over one shared WebSocket (/api/events/ws).
+// Components subscribe with a handler and fall back to polling while the
+// connection is down (onConnectionChange(false)).
+
+const RECONNECT_MIN_MS = 1000
+const RECONNECT_MAX_MS = 30000
+
+const handlers = new Set()
+let socket = null
+let connected = false
+let reconnectDelay = RECONNECT_MIN_MS
+let reconnectTimer = null
+
+const eventsUrl = () => {
+  const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws'
+  return `${protocol}://${window.location.host}/api/events/ws`
+}
+
+const setConnected = (value) => {
+  if (connected === value) return
+  connected = value
+  handlers.forEach(({ onConnectionChange }) => onConnectionChange(value))
+}
+
+const connect = () => {
+  if (socket || handlers.size === 0) return
+
+  socket = new WebSocket(eventsUrl())
+
+  socket.onopen = () => {
+    reconnectDelay = RECONNECT_MIN_MS
+    setConnected(true)
+  }
+
+  socket.onmessage = (message) => {
+    let event
+    try {
+      event = JSON.parse(message.data)
+    } catch (error) {
+      return
+    }
+    if (event.type === 'ping') return
+    handlers.forEach(({ onEvent }) => onEvent(event))
+  }
+
+  socket.onclose = () => {
+    socket = null
+    setConnected(false)
+    if (handlers.size === 0) return
+    // Reconnect with exponential backoff
+    reconnectTimer = setTimeout(() => {
+      reconnectTimer = null
+      connect()
+    }, reconnectDelay)
+    reconnectDelay = Math.min(reconnectDelay * 2, RECONNECT_MAX_MS)
+  }
+}
+
+/**
+ * Subscribe to live events ({ type, data, sent_at }).
+ * onConnectionChange is called right away with the current state and on
+ * every change. Returns an unsubscribe function.
+ */
+export const subscribeEvents = (onEvent, onConnectionChange = () => {}) => {
+  const handler = { onEvent, onConnectionChange }
+  handlers.add(handler)
+  onConnectionChange(connected)
+  connect()
+
+  return () => {
+    handlers.delete(handler)
+    if (handlers.size > 0) return
+    clearTimeout(reconnectTimer)
+    reconnectTimer = null
+    if (socket) {
+      socket.onclose = null
+      socket.close()
+      socket = null
+    }
+    connected = false
+  }
+}
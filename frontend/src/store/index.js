@@ -27,6 +27,26 @@ export const useCaseStore = create((set) => ({
   deleteCase: (id) => set((state) => ({
     cases: state.cases.filter((c) => c.id !== id),
   })),
+  
+  // Apply a page of the change feed: replace changed rows (dropping those
+  // that no longer match), add newly matching ones in ID order and remove
+  // deleted ones. While more pages remain, rows below the last loaded ID
+  // are left for "Load more" instead of jumping into the list.
+  applyCaseChanges: (changed, deletedIds, matches = () => true, complete = true) => set((state) => {
+    const byId = new Map(changed.map((c) => [c.id, c]))
+    const deleted = new Set(deletedIds)
+    const known = new Set(state.cases.map((c) => c.id))
+    const lowestId = Math.min(...state.cases.map((c) => c.id))
+    
+    const added = changed.filter((c) => !known.has(c.id) && matches(c) && (complete || c.id > lowestId))
+    const cases = state.cases
+      .filter((c) => !deleted.has(c.id))
+      .map((c) => (byId.has(c.id) ? { ...c, ...byId.get(c.id) } : c))
+      .filter((c) => !byId.has(c.id) || matches(c))
+    
+    if (added.length === 0) return { cases }
+    return { cases: [...added, ...cases].sort((a, b) => b.id - a.id) }
+  }),
 }))
 
 export const useOfficeStore = create((set) => ({